@@ -1,54 +1,210 @@
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit, minimize
-from scipy.stats import linregress
-from scipy.signal import savgol_filter
 import tkinter as tk
 from tkinter import filedialog
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import importlib.util
+import json
+import os
 import sys
 
-# Function 1: From asm_output_2.py - Fits I-V curves for different Vgs, extracts RD0 and MEXP
-def extract_output_params():
-    root = tk.Tk()
-    root.withdraw()  # Hide the root window
-    file_path = filedialog.askopenfilename(
-        title="Select I-V Data CSV File",
-        filetypes=[("CSV files", "*.csv")]
-    )
-    if not file_path:
-        print("No file selected. Exiting.")
+# numpy, pandas, matplotlib, scipy and numba take seconds to import cold, so
+# they are bound on first use by _load_numeric() rather than at import time:
+# the menu comes up immediately and only the first extraction pays for them.
+np = pd = plt = LineCollection = None
+curve_fit = least_squares = minimize = linregress = savgol_coeffs = csr_matrix = None
+
+# Model kernels are pure ndarray-in/ndarray-out, so _load_numeric() swaps them
+# for numba-compiled versions when numba is installed; cache=True keeps the
+# machine code between sessions.
+_JIT_MODELS = []
+
+
+def _model_jit(func):
+    _JIT_MODELS.append(func.__name__)
+    return func
+
+
+def _load_numeric():
+    global np, pd, plt, LineCollection
+    global curve_fit, least_squares, minimize, linregress, savgol_coeffs, csr_matrix
+    if np is not None:
+        return
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from scipy.optimize import curve_fit, least_squares, minimize
+    from scipy.stats import linregress
+    from scipy.signal import savgol_coeffs
+    from scipy.sparse import csr_matrix
+
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional; the models run as plain NumPy without it
         return
+    jit = njit(cache=True, fastmath=True)
+    module_globals = globals()
+    for name in _JIT_MODELS:
+        module_globals[name] = jit(module_globals[name])
+
+# Shared hidden Tk root for file dialogs; created once on first use
+_ROOT = None
+
+
+def _get_root():
+    global _ROOT
+    if _ROOT is None:
+        _ROOT = tk.Tk()
+        _ROOT.withdraw()  # Hide the root window
+    return _ROOT
+
+
+# Use the multi-threaded pyarrow CSV parser when it is installed
+_CSV_ENGINE = {"engine": "pyarrow"} if importlib.util.find_spec("pyarrow") else {}
+
+
+# Load only the columns an extractor needs. If a requested column is missing,
+# fall back to a full read so the caller's column check can report it (the C
+# parser raises ValueError for that, pyarrow a KeyError).
+# Parsed frames are cached per (path, columns, mtime, size), so re-running an
+# extraction on an unchanged file skips the parse; callers get a copy because
+# the fits modify their input.
+@lru_cache(maxsize=16)
+def _read_csv_cached(file_path, cols, mtime_ns, size):
+    try:
+        return pd.read_csv(file_path, usecols=list(cols) if cols else None, **_CSV_ENGINE)
+    except (ValueError, KeyError):
+        if cols is None:
+            raise
+        return pd.read_csv(file_path, **_CSV_ENGINE)
+
+
+def _read_csv(file_path, cols=None):
+    st = os.stat(file_path)
+    return _read_csv_cached(file_path, tuple(cols) if cols else None, st.st_mtime_ns, st.st_size).copy()
+
+
+# One figure per extractor, reused across runs while its window is still open
+_FIGS = {}
+
+
+def _get_fig(key, **kwargs):
+    fig = _FIGS.get(key)
+    if fig is None or not plt.fignum_exists(fig.number):
+        fig = plt.figure(**kwargs)
+        _FIGS[key] = fig
+    else:
+        fig.clear()
+    return fig
+
+
+# Savitzky-Golay smoothing with the filter built once per (window, order).
+# Interior points use the convolution kernel; the half-window at each end is
+# the least-squares polynomial fit over the first/last window, matching
+# savgol_filter(mode='interp').
+_SG_CACHE = {}
+
+
+def _savgol(y, window_length, polyorder):
+    if window_length > len(y):
+        raise ValueError("window_length must be less than or equal to the size of y")
+    key = (window_length, polyorder)
+    cached = _SG_CACHE.get(key)
+    if cached is None:
+        half = window_length // 2
+        x = np.arange(window_length, dtype=float)
+        vander = np.vander(x, polyorder + 1)
+        proj = vander @ np.linalg.pinv(vander)
+        cached = (savgol_coeffs(window_length, polyorder), proj[:half], proj[window_length - half:])
+        _SG_CACHE[key] = cached
+    coeffs, head, tail = cached
+    y = np.asarray(y, dtype=float)
+    out = np.convolve(y, coeffs, mode='same')
+    half = window_length // 2
+    if half:
+        out[:half] = head @ y[:window_length]
+        out[-half:] = tail @ y[-window_length:]
+    return out
+
+
+# Per-extractor work is split in two: a _fit_* half that takes the loaded
+# DataFrame and returns a picklable dict of results (or None after printing
+# why it stopped), and a _report_* half that plots and prints on the main
+# thread. The fit halves have no GUI state, so "run all" can send them to
+# worker processes.
+
+# Function 1: From asm_output_2.py - Fits I-V curves for different Vgs, extracts RD0 and MEXP
+VSAT = 1  # Saturation voltage (assumed constant)
+
+
+@_model_jit
+def output_id_model(Vds, RD0, MEXP):
+    return Vds / (RD0 * (1 + (Vds / VSAT) ** MEXP))
+
+
+def _output_id_residuals(p, Vds, Id):
+    return output_id_model(Vds, p[0], p[1]) - Id
+
+
+# Analytic Jacobian of output_id_model, so least_squares does not need finite
+# differences: dId/dRD0 = -Id/RD0, dId/dMEXP = -Id * ln(Vds/VSAT) * u/(1+u)
+# with u = (Vds/VSAT)^MEXP
+def _output_id_jacobian(p, Vds, Id):
+    RD0, MEXP = p
+    x = Vds / VSAT
+    u = x ** MEXP
+    model = Vds / (RD0 * (1 + u))
+    return np.column_stack([-model / RD0, -model * np.log(x) * u / (1 + u)])
+
+
+# Fit every Vgs curve in one least_squares solve. Each curve keeps its own
+# (RD0, MEXP) pair, so the stacked Jacobian is block-diagonal; it is passed as
+# a sparse matrix and TRF solves the subproblems with LSMR.
+def _fit_output_joint(Vds_list, Id_list, p0):
+    n_groups = len(Vds_list)
+    Vds = np.concatenate(Vds_list)
+    Id = np.concatenate(Id_list)
+    group = np.repeat(np.arange(n_groups), [len(v) for v in Vds_list])
+    rows = np.repeat(np.arange(len(Vds)), 2)
+    cols = np.column_stack([2 * group, 2 * group + 1]).ravel()
+    shape = (len(Vds), 2 * n_groups)
+
+    def resid(p):
+        return output_id_model(Vds, p[0::2][group], p[1::2][group]) - Id
+
+    def jac(p):
+        J = _output_id_jacobian((p[0::2][group], p[1::2][group]), Vds, Id)
+        return csr_matrix((J.ravel(), (rows, cols)), shape=shape)
+
+    return least_squares(resid, np.tile(p0, n_groups), jac=jac, method='trf',
+                         tr_solver='lsmr', x_scale='jac')
 
-    # Load CSV file
-    df = pd.read_csv(file_path)
 
+def _fit_output_params(df):
     # Preprocessing
     df["vgs"] = df["vgs"].round(4)
     df = df.sort_values(by=["vgs", "vds"])
 
-    # Constants
-    VSAT = 1  # Saturation voltage (assumed constant)
     initial_guess = [0.012, 2.0]  # RD0=12mΩ, MEXP=2
 
-    # Model function
-    def id_model(Vds, RD0, MEXP):
-        return Vds / (RD0 * (1 + (Vds / VSAT) ** MEXP))
-
     # Fit per Vgs
     unique_vgs = df["vgs"].unique()
     results = []
+    curves = []
 
-    plt.figure(figsize=(10, 6))
+    # Build the Vgs -> row-position map once instead of rescanning df per group
+    Vds_all = df["vds"].to_numpy()
+    Id_all = df["id"].to_numpy()
+    groups = df.groupby("vgs", sort=True).indices
 
     for vgs in unique_vgs:
         if vgs == 2.0:
             print("🔕 Skipping Vgs = 2.0 V from fitting/reporting.")
             continue
 
-        sub_df = df[df["vgs"] == vgs]
-        Vds = sub_df["vds"].values
-        Id = sub_df["id"].values
+        idx = groups[vgs]
+        Vds = Vds_all[idx]
+        Id = Id_all[idx]
 
         mask = (Vds > 0.01) & (Id > 0.01)
         Vds_fit = Vds[mask]
@@ -58,118 +214,157 @@ def extract_output_params():
             print(f"⚠️ Skipping Vgs = {vgs} V due to insufficient data points.")
             continue
 
-        try:
-            popt, _ = curve_fit(id_model, Vds_fit, Id_fit, p0=initial_guess)
-            RD0_fit, MEXP_fit = popt
-            results.append((vgs, RD0_fit, MEXP_fit))
+        curves.append((vgs, Vds, Id, Vds_fit, Id_fit))
 
-            Vds_smooth = np.linspace(min(Vds_fit), max(Vds_fit), 200)
-            Id_smooth = id_model(Vds_smooth, RD0_fit, MEXP_fit)
+    # Solve all curves jointly; if that does not converge, fall back to
+    # fitting each Vgs on its own so one bad curve cannot sink the rest
+    joint = None
+    if curves:
+        joint = _fit_output_joint([c[3] for c in curves], [c[4] for c in curves], initial_guess)
+    if joint is not None and joint.success:
+        fitted = [(c, joint.x[2 * i:2 * i + 2]) for i, c in enumerate(curves)]
+    else:
+        fitted = []
+        for c in curves:
+            fit = least_squares(_output_id_residuals, initial_guess, jac=_output_id_jacobian,
+                                args=(c[3], c[4]), method='lm')
+            if not fit.success:
+                print(f"❌ Fit failed for Vgs = {c[0]} V: {fit.message}")
+                continue
+            fitted.append((c, fit.x))
+
+    curves = []
+    for (vgs, Vds, Id, Vds_fit, _), (RD0_fit, MEXP_fit) in fitted:
+        results.append((vgs, RD0_fit, MEXP_fit))
+        curves.append((vgs, Vds, Id, Vds_fit.min(), Vds_fit.max()))
+
+    # Fit MEXP(Vgs) Dependency
+    mexp_fit = None
+    mexp_error = None
+    if len(results) >= 2:
+        results_array = np.array(results)
+        vgs_vals = results_array[:, 0]
+        mexp_vals = results_array[:, 2]
 
-            plt.plot(Vds, Id, 'o', label=f"Data Vgs={vgs}V")
-            plt.plot(Vds_smooth, Id_smooth, '-', label=f"Fit Vgs={vgs}V, MEXP={MEXP_fit:.2f}")
+        def mexp_vgs_func(vgs, a, b):
+            return a * vgs + b
 
+        try:
+            popt, _ = curve_fit(mexp_vgs_func, vgs_vals, mexp_vals)
+            mexp_fit = tuple(popt)
         except RuntimeError as e:
-            print(f"❌ Fit failed for Vgs = {vgs} V: {e}")
+            mexp_error = str(e)
+    else:
+        mexp_error = "need fitted parameters for at least two Vgs values"
+
+    params = {
+        "RD0": {f"{vgs:.4f}": rd0 for vgs, rd0, _ in results},
+        "MEXP": {f"{vgs:.4f}": mexp for vgs, _, mexp in results},
+    }
+    if mexp_fit is not None:
+        params["MEXP_A"], params["MEXP_B"] = mexp_fit
+
+    return {"results": results, "curves": curves, "mexp_fit": mexp_fit, "mexp_error": mexp_error,
+            "params": params}
+
+
+def _report_output_params(res, show_plot=True):
+    results = res["results"]
 
     # Plotting
-    plt.xlabel("Vds (V)")
-    plt.ylabel("Id (A)")
-    plt.title("I-V Curve Fit with Per-Vgs RD0 and MEXP")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    if show_plot:
+        fig = _get_fig("output", figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
+        for (vgs, Vds, Id, vds_min, vds_max), (_, RD0_fit, MEXP_fit) in zip(res["curves"], results):
+            Vds_smooth = np.linspace(vds_min, vds_max, 200)
+            Id_smooth = output_id_model(Vds_smooth, RD0_fit, MEXP_fit)
+
+            ax.plot(Vds, Id, 'o', label=f"Data Vgs={vgs}V")
+            ax.plot(Vds_smooth, Id_smooth, '-', label=f"Fit Vgs={vgs}V, MEXP={MEXP_fit:.2f}")
+
+        ax.set_xlabel("Vds (V)")
+        ax.set_ylabel("Id (A)")
+        ax.set_title("I-V Curve Fit with Per-Vgs RD0 and MEXP")
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        plt.show()
 
     # Print Individual Results
     print("\n✅ Extracted Parameters (Per Vgs):")
     for vgs, rd0, mexp in results:
         print(f"Vgs = {vgs:.4f} V -> RD0 = {rd0 * 1e3:.2f} mΩ, MEXP = {mexp:.2f}")
 
-    # Fit MEXP(Vgs) Dependency
-    results_array = np.array(results)
-    vgs_vals = results_array[:, 0]
-    mexp_vals = results_array[:, 2]
-
-    def mexp_vgs_func(vgs, a, b):
-        return a * vgs + b
-
-    try:
-        popt, _ = curve_fit(mexp_vgs_func, vgs_vals, mexp_vals)
-        a_fit, b_fit = popt
+    if res["mexp_fit"] is not None:
+        a_fit, b_fit = res["mexp_fit"]
         print(f"\n📈 Fitted MEXP(Vgs): MEXP ≈ {a_fit:.4f} * Vgs + {b_fit:.4f}")
-    except RuntimeError as e:
-        print(f"\n❌ Failed to fit MEXP(Vgs): {e}")
-
-# Function 2: From asm_rds_vgs_temp.py - Extracts UTE, UTES, UTED
-def extract_ute_utes_uted():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select CSV File", filetypes=[("CSV files", "*.csv")])
-
-    if not file_path:
-        print("No file selected.")
-        return
-
-    # Define exponential model for R_DS(on) vs. V_GS (for visualization)
-    def rds_model(vgs, a, b, c):
-        return a * np.exp(b * vgs) + c
+    else:
+        print(f"\n❌ Failed to fit MEXP(Vgs): {res['mexp_error']}")
 
-    # Define temperature dependence model for mobility: R_DS(on)(T) ∝ (T/298)^(-UTE)
-    def mobility_temp_model(temp, rds0, ute):
-        return rds0 * ((temp + 273.15) / 298.15) ** (-ute)
-
-    # Read the CSV file
-    try:
-        data = pd.read_csv(file_path)
-    except FileNotFoundError:
-        print("Error: CSV file not found.")
-        return
-    except Exception as e:
-        print(f"Error reading CSV file: {e}")
-        return
 
+# Function 2: From asm_rds_vgs_temp.py - Extracts UTE, UTES, UTED
+# Exponential model for R_DS(on) vs. V_GS (for visualization)
+@_model_jit
+def rds_model(vgs, a, b, c):
+    return a * np.exp(b * vgs) + c
+
+
+# Temperature dependence model for mobility: R_DS(on)(T) = RDS0 * (T/298)^(-UTE).
+# Linear in log space, so solve it in closed form instead of iterating:
+# log(rds) = log(RDS0) - UTE * log(T/298)
+def fit_mobility_temp(temp, rds):
+    temp = np.asarray(temp, dtype=float)
+    rds = np.asarray(rds, dtype=float)
+    mask = rds > 0
+    if np.count_nonzero(mask) < 2:
+        raise ValueError("need at least two positive R_DS(on) points")
+    slope, intercept, *_ = linregress(np.log((temp[mask] + 273.15) / 298.15), np.log(rds[mask]))
+    return np.exp(intercept), -slope
+
+
+def _fit_ute_utes_uted(data):
     # Verify required columns
     required_columns = ['vgs', 'rds', 'temp']
     if not all(col in data.columns for col in required_columns):
         print("Error: CSV file must contain 'vgs', 'rds', and 'temp' columns.")
-        return
-
-    # Initialize results
-    ute = None
-    utes = None
-    uted = None
-
-    # Plot R_DS(on) vs. V_GS for each temperature
-    plt.figure(figsize=(10, 6))
-    for temp in data['temp'].unique():
-        # Filter data for the current temperature
-        temp_data = data[data['temp'] == temp]
-        
-        # Fit R_DS(on) vs. V_GS for visualization
+        return None
+
+    # Fit R_DS(on) vs. V_GS for each temperature (for visualization)
+    vgs_all = data['vgs'].to_numpy()
+    rds_all = data['rds'].to_numpy()
+    temp_all = data['temp'].to_numpy()
+    temp_groups = data.groupby('temp', sort=True).indices
+    n_points = 100
+    fit_temps = np.empty(len(temp_groups))
+    segments = np.empty((len(temp_groups), n_points, 2))
+    n_fits = 0
+    for temp, idx in temp_groups.items():
+        # Slice the rows for the current temperature
+        vgs_t = vgs_all[idx]
+        rds_t = rds_all[idx]
         try:
             initial_guesses = [100, -0.1, 1]
-            popt, _ = curve_fit(rds_model, temp_data['vgs'], temp_data['rds'], p0=initial_guesses, maxfev=2000)
-            
-            # Plot data and fit
-            plt.scatter(temp_data['vgs'], temp_data['rds'], label=f'{temp}°C data')
-            vgs_range = np.linspace(temp_data['vgs'].min(), temp_data['vgs'].max(), 100)
-            plt.plot(vgs_range, rds_model(vgs_range, *popt), label=f'{temp}°C fit')
+            popt, _ = curve_fit(rds_model, vgs_t, rds_t, p0=initial_guesses, maxfev=2000)
         except RuntimeError:
             print(f"Warning: Curve fitting failed for {temp}°C.")
+            continue
+        vgs_range = np.linspace(vgs_t.min(), vgs_t.max(), n_points)
+        segments[n_fits, :, 0] = vgs_range
+        segments[n_fits, :, 1] = rds_model(vgs_range, *popt)
+        fit_temps[n_fits] = temp
+        n_fits += 1
 
     # Extract UTE: Use R_DS(on) at high V_GS (e.g., 5 V) where R_channel dominates
     vgs_high = 5.0  # Adjust based on CSV data
     high_vgs_data = data[np.abs(data['vgs'] - vgs_high) < 0.1]  # Tolerance for V_GS ≈ 5 V
     if high_vgs_data.empty:
         print(f"Error: No data found for V_GS ≈ {vgs_high} V.")
-        return
+        return None
 
     # Fit R_DS(on) vs. temperature to extract UTE
     try:
-        popt, _ = curve_fit(mobility_temp_model, high_vgs_data['temp'], high_vgs_data['rds'], p0=[0.1, -0.5], maxfev=2000)
-        ute = popt[1]
-    except RuntimeError:
+        _, ute = fit_mobility_temp(high_vgs_data['temp'], high_vgs_data['rds'])
+    except ValueError:
         print("Error: Failed to fit UTE.")
         ute = None
 
@@ -178,25 +373,44 @@ def extract_ute_utes_uted():
     if ute is not None:
         # Approximate R_ACC as a fraction of R_DS(on) (e.g., 50%, adjust based on device)
         r_acc_fraction = 0.5
-        r_acc_data = high_vgs_data.copy()
-        r_acc_data['rds'] = r_acc_data['rds'] * r_acc_fraction
+        temps_hv = high_vgs_data['temp'].to_numpy()
+        rds_hv_acc = high_vgs_data['rds'].to_numpy() * r_acc_fraction
         try:
-            popt_acc, _ = curve_fit(mobility_temp_model, r_acc_data['temp'], r_acc_data['rds'], p0=[0.05, -0.5], maxfev=2000)
-            utes = uted = popt_acc[1]  # Assume symmetry for simplicity
-        except RuntimeError:
+            _, ute_acc = fit_mobility_temp(temps_hv, rds_hv_acc)
+            utes = uted = ute_acc  # Assume symmetry for simplicity
+        except ValueError:
             print("Warning: Failed to fit UTES/UTED.")
             utes = uted = None
     else:
         utes = uted = None
 
-    # Finalize plot
-    plt.xlabel('V_GS (V)')
-    plt.ylabel('R_DS(on) (Ω)')
-    plt.title('R_DS(on) vs. V_GS for Different Temperatures (EPC2040)')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    return {
+        "vgs": vgs_all, "rds": rds_all, "temp": temp_all,
+        "segments": segments[:n_fits], "fit_temps": fit_temps[:n_fits],
+        "ute": ute, "utes": utes, "uted": uted,
+        "params": {"UTE": ute, "UTES": utes, "UTED": uted},
+    }
+
 
+def _report_ute_utes_uted(res, show_plot=True):
+    if show_plot:
+        # Draw all points as one scatter and all fits as one LineCollection,
+        # colored by temperature
+        fig = _get_fig("ute", figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
+        sc = ax.scatter(res["vgs"], res["rds"], c=res["temp"], cmap='viridis', label='Data')
+        if len(res["segments"]):
+            ax.add_collection(LineCollection(res["segments"], colors=sc.cmap(sc.norm(res["fit_temps"])), label='Fit'))
+            ax.autoscale_view()
+        fig.colorbar(sc, ax=ax, label='Temperature (°C)')
+        ax.set_xlabel('V_GS (V)')
+        ax.set_ylabel('R_DS(on) (Ω)')
+        ax.set_title('R_DS(on) vs. V_GS for Different Temperatures (EPC2040)')
+        ax.legend()
+        ax.grid(True)
+        plt.show()
+
+    ute, utes, uted = res["ute"], res["utes"], res["uted"]
     if ute is not None:
         print(f"UTE (Channel Mobility Temperature Coefficient): {ute:.4e}")
     else:
@@ -210,22 +424,13 @@ def extract_ute_utes_uted():
     else:
         print("UTED could not be determined.")
 
+
 # Function 3: From asm_rds_id.py - Extracts RDS(on) and VGS dependence
-def extract_rds_vgs_id():
-    def load_csv(file_path):
-        try:
-            data = pd.read_csv(file_path)
-            required_columns = ['vgs', 'rds', 'id']
-            if not all(col in data.columns for col in required_columns):
-                print("Error: CSV file must contain 'vgs', 'rds', and 'id' columns.")
-                return None
-            return data
-        except FileNotFoundError:
-            print("Error: CSV file not found.")
-            return None
-        except Exception as e:
-            print(f"Error reading CSV file: {e}")
-            return None
+def _fit_rds_vgs_id(data, vgs_max_fit=4.0):
+    required_columns = ['vgs', 'rds', 'id']
+    if not all(col in data.columns for col in required_columns):
+        print("Error: CSV file must contain 'vgs', 'rds', and 'id' columns.")
+        return None
 
     def filter_data(data, tolerance=0.01):
         id_target = data['id'].max()
@@ -247,7 +452,7 @@ def extract_rds_vgs_id():
     def smooth_data(vgs, rds, window_length=5, polyorder=2):
         try:
             window_length = min(window_length, len(rds) // 2 * 2 + 1)
-            return savgol_filter(rds, window_length=window_length, polyorder=polyorder)
+            return _savgol(rds, window_length, polyorder)
         except Exception as e:
             print(f"Warning: Smoothing failed ({e}). Using original data.")
             return rds
@@ -285,89 +490,37 @@ def extract_rds_vgs_id():
         rds_on = data_id[data_id['vgs'] >= vgs_max - 0.01]['rds'].min() if any(data_id['vgs'] >= vgs_max - 0.01) else np.nan
         return rds_on
 
-    def extract_rds_on_vgs_dependence(csv_file_path, vgs_max_fit=4.0):
-        data = load_csv(csv_file_path)
-        if data is None:
-            return None, None, None
-
-        vgs, rds, id_target = filter_data(data)
-        if vgs is None:
-            return None, None, id_target
-
-        rds_smooth = smooth_data(vgs, rds)
-        vgs_clean, rds_clean = remove_outliers(vgs, rds_smooth)
-        poly_coeffs, poly_func = fit_quadratic(vgs_clean, rds_clean, vgs_max_fit)
-        rds_on = extract_rds_on(data)
-
-        residuals = rds - poly_func(vgs) if poly_func is not None else np.zeros_like(rds)
-
-        results = {
-            'R_DS(on)': rds_on,
-            'V_GS_dependence_coefficients': poly_coeffs
-        }
-        plot_data = {
-            'vgs': vgs,
-            'rds': rds,
-            'rds_smooth': rds_smooth,
-            'vgs_clean': vgs_clean,
-            'rds_clean': rds_clean,
-            'poly_func': poly_func,
-            'residuals': residuals
-        }
-
-        return results, plot_data, id_target
+    vgs, rds, id_target = filter_data(data)
+    if vgs is None:
+        return None
 
-    def plot_rds_vgs(results, plot_data, id_target):
-        if plot_data['poly_func'] is None:
-            print("No plot generated due to fitting error.")
-            return
+    rds_smooth = smooth_data(vgs, rds)
+    vgs_clean, rds_clean = remove_outliers(vgs, rds_smooth)
+    poly_coeffs, poly_func = fit_quadratic(vgs_clean, rds_clean, vgs_max_fit)
+    rds_on = extract_rds_on(data)
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+    residuals = rds - poly_func(vgs) if poly_func is not None else np.zeros_like(rds)
 
-        ax1.plot(plot_data['vgs'], plot_data['rds'], marker='o', linestyle='-', label='Original R_DS(on)')
-        ax1.plot(plot_data['vgs'], plot_data['rds_smooth'], linestyle=':', label='Smoothed R_DS(on)')
-        ax1.plot(plot_data['vgs_clean'], plot_data['rds_clean'], marker='x', linestyle='', label='Cleaned Data for Fit')
-
-        vgs_fit = np.linspace(min(plot_data['vgs']), max(plot_data['vgs']), 100)
-        rds_fit = plot_data['poly_func'](vgs_fit)
-        ax1.plot(vgs_fit, rds_fit, linestyle='--', label='Quadratic Fit')
-
-        if not np.isnan(results['R_DS(on)']):
-            vgs_max = max(plot_data['vgs'])
-            ax1.plot(vgs_max, results['R_DS(on)'], marker='x', markersize=10,
-                     label=f'R_DS(on) = {results["R_DS(on)"]:.3f} Ω at V_GS ≈ 5 V')
-
-        ax1.set_ylabel('R_DS(on) (Ω)')
-        ax1.set_title(f'R_DS(on) vs. V_GS for EPC2040 (id ≈ {id_target:.2f} A)')
-        ax1.grid(True)
-        ax1.legend()
-
-        ax2.plot(plot_data['vgs'], plot_data['residuals'], marker='o', linestyle='-', color='red', label='Residuals')
-        ax2.axhline(0, color='black', linestyle='--', linewidth=0.5)
-        ax2.set_xlabel('V_GS (V)')
-        ax2.set_ylabel('Residuals (Ω)')
-        ax2.set_title('Fit Residuals')
-        ax2.grid(True)
-        ax2.legend()
+    results = {
+        'R_DS(on)': rds_on,
+        'V_GS_dependence_coefficients': poly_coeffs
+    }
+    plot_data = {
+        'vgs': vgs,
+        'rds': rds,
+        'rds_smooth': rds_smooth,
+        'vgs_clean': vgs_clean,
+        'rds_clean': rds_clean,
+        'poly_func': poly_func,
+        'residuals': residuals
+    }
 
-        plt.tight_layout()
-        plt.show()
+    params = {"RDS_ON": rds_on, "VGS_COEFFS": list(poly_coeffs)}
+    return {"results": results, "plot_data": plot_data, "id_target": id_target, "params": params}
 
-    vgs_max_fit = 4.0
-    root = tk.Tk()
-    root.withdraw()
-    csv_file = filedialog.askopenfilename(
-        title="Select CSV File",
-        filetypes=[("CSV files", "*.csv")]
-    )
 
-    if not csv_file:
-        print("No file selected.")
-        return
-
-    results, plot_data, id_target = extract_rds_on_vgs_dependence(csv_file, vgs_max_fit)
-    if results is None:
-        return
+def _report_rds_vgs_id(res, show_plot=True):
+    results, plot_data, id_target = res["results"], res["plot_data"], res["id_target"]
 
     print("Extracted Parameters:")
     if not np.isnan(results['R_DS(on)']):
@@ -382,38 +535,74 @@ def extract_rds_vgs_id():
     else:
         print("Error: Could not compute V_GS dependence coefficients.")
 
-    if plot_data:
-        plot_rds_vgs(results, plot_data, id_target)
+    if not show_plot:
+        return
+    if plot_data['poly_func'] is None:
+        print("No plot generated due to fitting error.")
+        return
+
+    fig = _get_fig("rds_vgs", figsize=(10, 8))
+    ax1, ax2 = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+
+    ax1.plot(plot_data['vgs'], plot_data['rds'], marker='o', linestyle='-', label='Original R_DS(on)')
+    ax1.plot(plot_data['vgs'], plot_data['rds_smooth'], linestyle=':', label='Smoothed R_DS(on)')
+    ax1.plot(plot_data['vgs_clean'], plot_data['rds_clean'], marker='x', linestyle='', label='Cleaned Data for Fit')
+
+    vgs_fit = np.linspace(min(plot_data['vgs']), max(plot_data['vgs']), 100)
+    rds_fit = plot_data['poly_func'](vgs_fit)
+    ax1.plot(vgs_fit, rds_fit, linestyle='--', label='Quadratic Fit')
+
+    if not np.isnan(results['R_DS(on)']):
+        vgs_max = max(plot_data['vgs'])
+        ax1.plot(vgs_max, results['R_DS(on)'], marker='x', markersize=10,
+                 label=f'R_DS(on) = {results["R_DS(on)"]:.3f} Ω at V_GS ≈ 5 V')
+
+    ax1.set_ylabel('R_DS(on) (Ω)')
+    ax1.set_title(f'R_DS(on) vs. V_GS for EPC2040 (id ≈ {id_target:.2f} A)')
+    ax1.grid(True)
+    ax1.legend()
+
+    ax2.plot(plot_data['vgs'], plot_data['residuals'], marker='o', linestyle='-', color='red', label='Residuals')
+    ax2.axhline(0, color='black', linestyle='--', linewidth=0.5)
+    ax2.set_xlabel('V_GS (V)')
+    ax2.set_ylabel('Residuals (Ω)')
+    ax2.set_title('Fit Residuals')
+    ax2.grid(True)
+    ax2.legend()
+
+    fig.tight_layout()
+    plt.show()
+
 
 # Function 4: From asm_c_upgraded.py - Capacitance fit
-def extract_capacitance_params():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select Figure 5b CSV", filetypes=[("CSV files", "*.csv")])
-    if not file_path:
-        print("No file selected. Exiting.")
-        return
+VDSATCV = 2.5  # Fixed scaling voltage as in your model
+
+
+@_model_jit
+def capacitance_model(vds, c0, kcap):
+    return c0 * np.exp(-kcap * (vds / VDSATCV))
 
-    # Load data
-    df = pd.read_csv(file_path)
-    if not {"vds", "c", "type"}.issubset(df.columns):
-        print("CSV must contain columns: vds, c, type")
-        return
 
-    VDSATCV = 2.5  # Fixed scaling voltage as in your model
+CAPACITANCE_TYPES = ["ciss", "coss", "crss"]
+CAPACITANCE_PARAM_NAMES = {
+    "crss": ("CGDO", "KCAP_CGDO"),
+    "ciss": ("CGSO", "KCAP_CGSO"),
+    "coss": ("CDSO", "KCAP_CDSO")
+}
 
-    # Model
-    def capacitance_model(vds, c0, kcap):
-        return c0 * np.exp(-kcap * (vds / VDSATCV))
+
+def _fit_capacitance_params(df):
+    if not {"vds", "c", "type"}.issubset(df.columns):
+        print("CSV must contain columns: vds, c, type")
+        return None
 
     # Extract and fit each type
     results = {}
-    types = ["ciss", "coss", "crss"]
-
-    plt.figure(figsize=(10, 6))
+    data = {}
+    type_lower = df["type"].str.lower()
 
-    for t in types:
-        d = df[df["type"].str.lower() == t]
+    for t in CAPACITANCE_TYPES:
+        d = df[type_lower == t]
         if d.empty:
             print(f"No data for type: {t}")
             continue
@@ -428,58 +617,68 @@ def extract_capacitance_params():
 
         c0_fit, kcap_fit = popt
         results[t] = (c0_fit, kcap_fit)
+        data[t] = (vds, c)
+
+    params = {}
+    for t, (c0_fit, kcap_fit) in results.items():
+        cname, kname = CAPACITANCE_PARAM_NAMES[t]
+        params[cname] = c0_fit
+        params[kname] = kcap_fit
+
+    return {"results": results, "data": data, "params": params}
+
+
+def _report_capacitance_params(res, show_plot=True):
+    results = res["results"]
+
+    if show_plot:
+        fig = _get_fig("capacitance", figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
 
         # Plot fit vs data
-        vds_fit = np.linspace(min(vds), max(vds), 200)
-        c_fit = capacitance_model(vds_fit, c0_fit, kcap_fit)
-        plt.plot(vds, c, 'o', label=f"{t.upper()} data")
-        plt.plot(vds_fit, c_fit, '-', label=f"{t.upper()} fit (KCAP={kcap_fit:.4f})")
-
-    # Plot settings
-    plt.xlabel("Vds (V)")
-    plt.ylabel("Capacitance (pF)")
-    plt.title("Capacitance vs Vds Fit")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+        for t, (vds, c) in res["data"].items():
+            c0_fit, kcap_fit = results[t]
+            vds_fit = np.linspace(min(vds), max(vds), 200)
+            c_fit = capacitance_model(vds_fit, c0_fit, kcap_fit)
+            ax.plot(vds, c, 'o', label=f"{t.upper()} data")
+            ax.plot(vds_fit, c_fit, '-', label=f"{t.upper()} fit (KCAP={kcap_fit:.4f})")
+
+        # Plot settings
+        ax.set_xlabel("Vds (V)")
+        ax.set_ylabel("Capacitance (pF)")
+        ax.set_title("Capacitance vs Vds Fit")
+        ax.grid(True)
+        ax.legend()
+        fig.tight_layout()
+        plt.show()
 
     # Show extracted results
     print("\n✅ Extracted Parameters:")
 
-    name_map = {
-        "crss": ("CGDO", "KCAP_CGDO"),
-        "ciss": ("CGSO", "KCAP_CGSO"),
-        "coss": ("CDSO", "KCAP_CDSO")
-    }
-
-    for t in types:
+    for t in CAPACITANCE_TYPES:
         if t in results:
             c0, kcap = results[t]
-            cname, kname = name_map[t]
+            cname, kname = CAPACITANCE_PARAM_NAMES[t]
             print(f".PARAM {cname:<6} = {c0:.4e}  ; base capacitance (pF)")
             print(f".PARAM {kname:<10} = {kcap:.4f}   ; voltage dependence (1/V)")
 
+
 # Function 5: From asm_transfer_upgraded.py - Transfer characteristics
-def extract_transfer_params():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select CSV (vgs, id, temp)", filetypes=[("CSV Files", "*.csv")])
-    if not file_path:
-        print("No file selected.")
-        return
+@_model_jit
+def transfer_id_model(vgs, kp, voff, vse):
+    return np.where(vgs > voff, kp * (vgs - voff)**vse, 0.0)
+
 
-    # Load Data
-    df = pd.read_csv(file_path)
+def _fit_transfer_params(df):
     if not {"vgs", "id", "temp"}.issubset(df.columns):
         print("CSV must contain vgs, id, temp")
-        return
+        return None
 
     # Split data
     temps = sorted(df["temp"].unique())
     if len(temps) != 2:
         print("Expecting data for exactly two temperatures (e.g., 25 and 125°C")
-        return
+        return None
 
     data_by_temp = {T: df[df["temp"] == T] for T in temps}
 
@@ -491,29 +690,52 @@ def extract_transfer_params():
     voff_init = estimate_voff(data_by_temp[25])
     print(f"Estimated VOFF: {voff_init:.3f} V")
 
-    # Log-log linear regression to get VSE and KP at each temp
-    def log_fit(vgs, id_, voff):
-        mask = (vgs > voff) & (id_ > 1e-6)
-        if np.count_nonzero(mask) < 3:
-            return 1.0, 1.0
-        x = np.log(vgs[mask] - voff)
-        y = np.log(id_[mask])
-        slope, intercept = np.polyfit(x, y, 1)
-        vse = slope
-        kp = np.exp(intercept)
-        return vse, kp
-
-    vse_init, kp_25_init = log_fit(data_by_temp[25]["vgs"].values, data_by_temp[25]["id"].values, voff_init)
-    _, kp_125_init = log_fit(data_by_temp[125]["vgs"].values, data_by_temp[125]["id"].values, voff_init)
+    # Log-log linear regression to get VSE and KP at each temp. Both temps
+    # share voff_init, so log(vgs - voff) is computed once per distinct Vgs
+    # grid, and the straight line is fitted in closed form (no Vandermonde /
+    # lstsq round trip through np.polyfit).
+    def log_fit_shared(voff, datasets):
+        x_cache = []
+        fits = []
+        for vgs, id_ in datasets:
+            for vgs_cached, x_cached in x_cache:
+                if np.array_equal(vgs_cached, vgs):
+                    x_full = x_cached
+                    break
+            else:
+                x_full = np.full(len(vgs), np.nan)
+                above = vgs > voff
+                x_full[above] = np.log(vgs[above] - voff)
+                x_cache.append((vgs, x_full))
+
+            mask = (vgs > voff) & (id_ > 1e-6)
+            if np.count_nonzero(mask) < 3:
+                fits.append((1.0, 1.0))
+                continue
+            x = x_full[mask]
+            y = np.log(id_[mask])
+            dx = x - x.mean()
+            sxx = dx @ dx
+            if sxx == 0:
+                fits.append((1.0, 1.0))
+                continue
+            slope = dx @ (y - y.mean()) / sxx
+            intercept = y.mean() - slope * x.mean()
+            vse = slope
+            kp = np.exp(intercept)
+            fits.append((vse, kp))
+        return fits
+
+    (vse_init, kp_25_init), (_, kp_125_init) = log_fit_shared(voff_init, [
+        (data_by_temp[25]["vgs"].values, data_by_temp[25]["id"].values),
+        (data_by_temp[125]["vgs"].values, data_by_temp[125]["id"].values),
+    ])
 
     # Combined fitting model
-    def id_model(vgs, kp, voff, vse):
-        return np.where(vgs > voff, kp * (vgs - voff)**vse, 0.0)
-
     def loss_fn(params, data_25, data_125):
         kp_25, kp_125, voff, vse = params
-        id_25_pred = id_model(data_25["vgs"].values, kp_25, voff, vse)
-        id_125_pred = id_model(data_125["vgs"].values, kp_125, voff, vse)
+        id_25_pred = transfer_id_model(data_25["vgs"].values, kp_25, voff, vse)
+        id_125_pred = transfer_id_model(data_125["vgs"].values, kp_125, voff, vse)
         err_25 = np.log1p(np.abs(id_25_pred - data_25["id"].values))
         err_125 = np.log1p(np.abs(id_125_pred - data_125["id"].values))
         return np.mean(err_25**2) + np.mean(err_125**2)
@@ -527,24 +749,34 @@ def extract_transfer_params():
     kp_25, kp_125, voff_fit, vse_fit = res.x
     ute = np.log(kp_125 / kp_25) / np.log(125 / 25)
 
+    return {
+        "data": {T: (data_by_temp[T]["vgs"].values, data_by_temp[T]["id"].values) for T in (25, 125)},
+        "kp_25": kp_25, "kp_125": kp_125, "voff": voff_fit, "vse": vse_fit, "ute": ute,
+        "params": {"VOFF": voff_fit, "VSE": vse_fit, "KP_25C": kp_25, "KP_125C": kp_125, "UTE": ute},
+    }
+
+
+def _report_transfer_params(res, show_plot=True):
+    kp_25, kp_125, voff_fit, vse_fit = res["kp_25"], res["kp_125"], res["voff"], res["vse"]
+
     # Plot
-    plt.figure(figsize=(10, 6))
-    for T, color in zip([25, 125], ['b', 'r']):
-        d = data_by_temp[T]
-        vgs = d["vgs"].values
-        id_meas = d["id"].values
-        kp = kp_25 if T == 25 else kp_125
-        id_pred = id_model(vgs, kp, voff_fit, vse_fit)
-        plt.plot(vgs, id_meas, 'o', label=f"Data @ {T}°C", color=color)
-        plt.plot(vgs, id_pred, '-', label=f"Fit @ {T}°C", color=color)
-
-    plt.xlabel("Vgs (V)")
-    plt.ylabel("Id (A)")
-    plt.title("Transfer Characteristics Fit (Auto Extracted)")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    if show_plot:
+        fig = _get_fig("transfer", figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
+        for T, color in zip([25, 125], ['b', 'r']):
+            vgs, id_meas = res["data"][T]
+            kp = kp_25 if T == 25 else kp_125
+            id_pred = transfer_id_model(vgs, kp, voff_fit, vse_fit)
+            ax.plot(vgs, id_meas, 'o', label=f"Data @ {T}°C", color=color)
+            ax.plot(vgs, id_pred, '-', label=f"Fit @ {T}°C", color=color)
+
+        ax.set_xlabel("Vgs (V)")
+        ax.set_ylabel("Id (A)")
+        ax.set_title("Transfer Characteristics Fit (Auto Extracted)")
+        ax.grid(True)
+        ax.legend()
+        fig.tight_layout()
+        plt.show()
 
     # Output
     print("\n✅ Extracted Parameters:")
@@ -552,26 +784,18 @@ def extract_transfer_params():
     print(f"VSE     = {vse_fit:.4f}")
     print(f"KP_25C  = {kp_25:.4f} A/V^{vse_fit:.2f}")
     print(f"KP_125C = {kp_125:.4f} A/V^{vse_fit:.2f}")
-    print(f"UTE     = {ute:.4f}")
+    print(f"UTE     = {res['ute']:.4f}")
 
-# Function 6: From asm_lambdas.py - Lambda extraction
-def extract_lambdas():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select Output Characteristic CSV", filetypes=[("CSV files", "*.csv")])
-    if not file_path:
-        print("No file selected.")
-        return
 
-    # Load CSV
-    df = pd.read_csv(file_path)
+# Function 6: From asm_lambdas.py - Lambda extraction
+def _fit_lambdas(df, voff=1.7892):
     if not {"vds", "id", "vgs"}.issubset(df.columns):
         print("CSV must contain: vds, id, vgs")
-        return
+        return None
 
     # Parameters
     VGS_target = 4  # Target curve for fitting
-    VOFF = 1.7892     # Known from previous extraction
+    VOFF = voff       # Known from previous extraction (transfer fit, when available)
 
     # Filter VGS = 3 V
     df_3v = df[np.isclose(df["vgs"], VGS_target)]
@@ -596,50 +820,44 @@ def extract_lambdas():
     LAMBDA1 = 0.015  # Or set to 0 if unknown
     LAMBDA0 = lambda_vgs3 - LAMBDA1 * delta_vgs
 
+    return {
+        "vds": vds, "id": id_, "vds_sat": vds_sat, "slope": slope, "intercept": intercept,
+        "lambda": lambda_vgs3, "VOFF": VOFF, "LAMBDA0": LAMBDA0, "LAMBDA1": LAMBDA1,
+        "params": {"LAMBDA": lambda_vgs3, "LAMBDA0": LAMBDA0, "LAMBDA1": LAMBDA1},
+    }
+
+
+def _report_lambdas(res, show_plot=True):
     # Plotting
-    plt.figure(figsize=(8, 5))
-    plt.plot(vds, id_, 'o', label='Vgs = 3 V data')
-    plt.plot(vds_sat, slope * vds_sat + intercept, '-', label='Linear fit in saturation')
-    plt.xlabel("Vds (V)")
-    plt.ylabel("Id (A)")
-    plt.title("Output Characteristic Fit (Vgs = 3 V)")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    if show_plot:
+        vds_sat = res["vds_sat"]
+        fig = _get_fig("lambdas", figsize=(8, 5))
+        ax = fig.add_subplot(1, 1, 1)
+        ax.plot(res["vds"], res["id"], 'o', label='Vgs = 3 V data')
+        ax.plot(vds_sat, res["slope"] * vds_sat + res["intercept"], '-', label='Linear fit in saturation')
+        ax.set_xlabel("Vds (V)")
+        ax.set_ylabel("Id (A)")
+        ax.set_title("Output Characteristic Fit (Vgs = 3 V)")
+        ax.grid(True)
+        ax.legend()
+        fig.tight_layout()
+        plt.show()
 
     # Output results
     print("\n✅ Extracted Channel Length Modulation:")
-    print(f"λ (Vgs = 3 V)     = {lambda_vgs3:.4f} 1/V")
-    print(f"Assumed VOFF      = {VOFF:.4f} V")
-    print(f"Assumed LAMBDA1   = {LAMBDA1:.4f} 1/V^2")
-    print(f"Calculated LAMBDA0= {LAMBDA0:.4f} 1/V")
-
-# Function 7: From asm_thermal_R.py - Thermal resistance RTH0
-def extract_rth0():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select CSV File", filetypes=[("CSV files", "*.csv")])
+    print(f"λ (Vgs = 3 V)     = {res['lambda']:.4f} 1/V")
+    print(f"Assumed VOFF      = {res['VOFF']:.4f} V")
+    print(f"Assumed LAMBDA1   = {res['LAMBDA1']:.4f} 1/V^2")
+    print(f"Calculated LAMBDA0= {res['LAMBDA0']:.4f} 1/V")
 
-    if not file_path:
-        print("No file selected.")
-        return
-
-    # Read the CSV file
-    try:
-        data = pd.read_csv(file_path)
-    except FileNotFoundError:
-        print("Error: CSV file not found or inaccessible.")
-        return
-    except Exception as e:
-        print(f"Error reading CSV file: {e}")
-        return
 
+# Shared cleaning for the Temp/Rds/Id datasets used by functions 7 and 8
+def _clean_rds_temp_data(data):
     # Verify required columns
     required_columns = ['Temp', 'Rds', 'Id']
     if not all(col in data.columns for col in required_columns):
         print(f"Error: CSV file must contain {required_columns} columns.")
-        return
+        return None
 
     # Remove NaN or infinite values
     data = data.dropna()
@@ -647,7 +865,7 @@ def extract_rth0():
 
     if data.empty:
         print("Error: No valid data after cleaning.")
-        return
+        return None
 
     # Check if Id is constant
     if data['Id'].nunique() != 1:
@@ -656,7 +874,16 @@ def extract_rth0():
 
     if data.empty:
         print("Error: No data for Id = 1.5 A.")
-        return
+        return None
+
+    return data
+
+
+# Function 7: From asm_thermal_R.py - Thermal resistance RTH0
+def _fit_rth0(data):
+    data = _clean_rds_temp_data(data)
+    if data is None:
+        return None
 
     # Extract temperature and R_DS(on)
     temp = data['Temp'].values  # Assumed T_j
@@ -696,73 +923,51 @@ def extract_rth0():
         t_ambient = t_j_min - p_d_min * rth0  # Adjust T_ambient to fit the line
     else:
         print("Error: Power dissipation range is zero, cannot calculate RTH0.")
-        return
+        return None
 
     print(f"Debug: Calculated T_ambient = {t_ambient:.2f}°C, RTH0 = {rth0:.4e} °C/W")
 
+    return {
+        "power": power, "temp": temp, "rth0": rth0,
+        "p_d": (p_d_min, p_d_max), "t_j": (t_j_min, t_j_max),
+        "params": {"RTH0": rth0},
+    }
+
+
+def _report_rth0(res, show_plot=True):
     # Plot T_j vs. P_d with line between min and max points
-    plt.figure(figsize=(10, 6))
-    plt.scatter(power, temp, label='Data', color='blue', alpha=0.5)
-    plt.plot([p_d_min, p_d_max], [t_j_min, t_j_max], label='Fit (Min to Max)', color='red')
-    plt.xlabel('Power Dissipation (W)')
-    plt.ylabel('Junction Temperature (°C)')
-    plt.title('Junction Temperature vs. Power Dissipation (EPC2040, V_GS = 5 V, I_D = 1.5 A)')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    if show_plot:
+        fig = _get_fig("rth0", figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
+        ax.scatter(res["power"].astype(np.float32), res["temp"].astype(np.float32),
+                   label='Data', color='blue', alpha=0.5, s=8, rasterized=True)
+        ax.plot(res["p_d"], res["t_j"], label='Fit (Min to Max)', color='red')
+        ax.set_xlabel('Power Dissipation (W)')
+        ax.set_ylabel('Junction Temperature (°C)')
+        ax.set_title('Junction Temperature vs. Power Dissipation (EPC2040, V_GS = 5 V, I_D = 1.5 A)')
+        ax.legend()
+        ax.grid(True)
+        plt.show()
 
+    rth0 = res["rth0"]
     if rth0 is not None:
         print(f"RTH0 (Thermal Resistance): {rth0:.4e} °C/W")
     else:
         print("RTH0 could not be determined.")
 
-# Function 8: From asm_rds_temp.py - KRSC, KRDC
-def extract_krsc_krdc():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select CSV File", filetypes=[("CSV files", "*.csv")])
-
-    if not file_path:
-        print("No file selected.")
-        return
-
-    # Define temperature dependence model: R_DS(on)(T) = R0 * (1 + KRSC * (T - T_ref))
-    def rds_temp_model(temp, r0, krsc):
-        t_ref = 25.0  # Reference temperature in °C
-        return r0 * (1 + krsc * (temp - t_ref))
-
-    # Read the CSV file
-    try:
-        data = pd.read_csv(file_path)
-    except FileNotFoundError:
-        print("Error: CSV file not found.")
-        return
-    except Exception as e:
-        print(f"Error reading CSV file: {e}")
-        return
-
-    # Verify required columns
-    required_columns = ['Temp', 'Rds', 'Id']
-    if not all(col in data.columns for col in required_columns):
-        print(f"Error: CSV file must contain {required_columns} columns.")
-        return
-
-    # Remove NaN or infinite values
-    data = data.dropna()
-    data = data[np.isfinite(data['Temp']) & np.isfinite(data['Rds']) & np.isfinite(data['Id'])]
 
-    if data.empty:
-        print("Error: No valid data after cleaning.")
-        return
+# Function 8: From asm_rds_temp.py - KRSC, KRDC
+# Temperature dependence model: R_DS(on)(T) = R0 * (1 + KRSC * (T - T_ref))
+@_model_jit
+def rds_temp_model(temp, r0, krsc):
+    t_ref = 25.0  # Reference temperature in °C
+    return r0 * (1 + krsc * (temp - t_ref))
 
-    # Check if Id is constant
-    if data['Id'].nunique() != 1:
-        print("Warning: Id is not constant. Using data for Id = 1.5 A.")
-        data = data[data['Id'] == 1.5]
 
-    if data.empty:
-        print("Error: No data for Id = 1.5 A.")
-        return
+def _fit_krsc_krdc(data):
+    data = _clean_rds_temp_data(data)
+    if data is None:
+        return None
 
     # Extract temperature and R_DS(on)
     temp = data['Temp'].values
@@ -772,33 +977,44 @@ def extract_krsc_krdc():
     rds_25 = data[data['Temp'] == 25]['Rds'].mean()
     if abs(rds_25 - 1.0) < 0.01:  # Check if normalized
         print("Note: R_DS(on) appears normalized to 1 at 25°C.")
-        r0_init = 1.0
-    else:
-        r0_init = rds_25  # Use actual R_DS(on) at 25°C
 
-    # Fit R_DS(on) vs. temperature
+    # Fit R_DS(on) vs. temperature. The model is linear in (R0, R0 * KRSC),
+    # so a straight-line fit against (T - T_ref) gives both in closed form.
     try:
-        initial_guesses = [r0_init, 0.005]  # R0 ≈ R_DS(on)(25°C), KRSC ≈ 0.005/°C
-        popt, _ = curve_fit(rds_temp_model, temp, rds, p0=initial_guesses, maxfev=5000)
-        r0, krsc = popt
-    except RuntimeError as e:
+        slope, intercept, *_ = linregress(temp - 25.0, rds)
+    except ValueError as e:
         print(f"Error: Curve fitting failed: {e}")
-        return
+        return None
+    if intercept == 0:
+        print("Error: Curve fitting failed: fitted R0 is zero.")
+        return None
+    r0 = intercept
+    krsc = slope / intercept
 
     # Assume KRSC = KRDC (symmetric contact resistances)
     krdc = krsc
 
+    return {"temp": temp, "rds": rds, "r0": r0, "krsc": krsc, "krdc": krdc,
+            "params": {"KRSC": krsc, "KRDC": krdc}}
+
+
+def _report_krsc_krdc(res, show_plot=True):
+    temp, r0, krsc, krdc = res["temp"], res["r0"], res["krsc"], res["krdc"]
+
     # Plot data and fit
-    plt.figure(figsize=(10, 6))
-    plt.scatter(temp, rds, label='Data', color='blue', alpha=0.5)
-    temp_range = np.linspace(min(temp), max(temp), 100)
-    plt.plot(temp_range, rds_temp_model(temp_range, r0, krsc), label='Fit', color='red')
-    plt.xlabel('Temperature (°C)')
-    plt.ylabel('R_DS(on) (Ω)')
-    plt.title('R_DS(on) vs. Temperature (EPC2040, I_D = 1.5 A)')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    if show_plot:
+        fig = _get_fig("krsc", figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
+        ax.scatter(temp.astype(np.float32), res["rds"].astype(np.float32),
+                   label='Data', color='blue', alpha=0.5, s=8, rasterized=True)
+        temp_range = np.linspace(min(temp), max(temp), 100)
+        ax.plot(temp_range, rds_temp_model(temp_range, r0, krsc), label='Fit', color='red')
+        ax.set_xlabel('Temperature (°C)')
+        ax.set_ylabel('R_DS(on) (Ω)')
+        ax.set_title('R_DS(on) vs. Temperature (EPC2040, I_D = 1.5 A)')
+        ax.legend()
+        ax.grid(True)
+        plt.show()
 
     if krsc is not None and krdc is not None:
         print(f"KRSC (Source Contact Resistance Temperature Coefficient): {krsc:.4e} /°C")
@@ -806,46 +1022,48 @@ def extract_krsc_krdc():
     else:
         print("KRSC and KRDC could not be determined.")
 
+
 # Function 9: From asm_temp_vth.py - VTH vs Temp
-def extract_temp_vth():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select CSV (temp, vth)", filetypes=[("CSV Files", "*.csv")])
-    if not file_path:
-        print("No file selected.")
-        return
+@_model_jit
+def vth_model(temp, voff0, kvto):
+    return voff0 + kvto * (temp - 25)
 
-    # Load data
-    df = pd.read_csv(file_path)
+
+def _fit_temp_vth(df):
     if not {"temp", "vth"}.issubset(df.columns):
         print("CSV must contain columns: temp, vth")
-        return
+        return None
 
     temps = df["temp"].values
     vths = df["vth"].values
 
-    # Define model
-    def vth_model(temp, voff0, kvto):
-        return voff0 + kvto * (temp - 25)
-
     # Fit
     popt, _ = curve_fit(vth_model, temps, vths, p0=[vths[0], -2e-3])
     voff0, kvto = popt
 
+    return {"temps": temps, "vths": vths, "voff0": voff0, "kvto": kvto,
+            "params": {"VOFF0": voff0, "KVTO": kvto}}
+
+
+def _report_temp_vth(res, show_plot=True):
+    temps, vths, voff0, kvto = res["temps"], res["vths"], res["voff0"], res["kvto"]
+
     # Plot
-    temp_fit = np.linspace(min(temps), max(temps), 200)
-    vth_fit = vth_model(temp_fit, voff0, kvto)
-
-    plt.figure(figsize=(8, 5))
-    plt.plot(temps, vths, 'o', label="Data")
-    plt.plot(temp_fit, vth_fit, '-', label=f"Fit: VOFF0={voff0:.4f}, KVTO={kvto*1e3:.2f} mV/°C")
-    plt.xlabel("Temperature (°C)")
-    plt.ylabel("Threshold Voltage Vth (V)")
-    plt.title("Vth vs Temperature Fit")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    if show_plot:
+        temp_fit = np.linspace(min(temps), max(temps), 200)
+        vth_fit = vth_model(temp_fit, voff0, kvto)
+
+        fig = _get_fig("temp_vth", figsize=(8, 5))
+        ax = fig.add_subplot(1, 1, 1)
+        ax.plot(temps, vths, 'o', label="Data")
+        ax.plot(temp_fit, vth_fit, '-', label=f"Fit: VOFF0={voff0:.4f}, KVTO={kvto*1e3:.2f} mV/°C")
+        ax.set_xlabel("Temperature (°C)")
+        ax.set_ylabel("Threshold Voltage Vth (V)")
+        ax.set_title("Vth vs Temperature Fit")
+        ax.grid(True)
+        ax.legend()
+        fig.tight_layout()
+        plt.show()
 
     # Output
     print("\n✅ Extracted Parameters:")
@@ -861,45 +1079,244 @@ def extract_temp_vth():
             f.write(f".PARAM VOFF={{VOFF0 + KVTO*(TEMP - 25)}}\n")
         print("Saved to params.txt")
 
+
+# Extractor registry: key -> (file dialog title, CSV columns, fit, report)
+_EXTRACTORS = {
+    "output": ("Select I-V Data CSV File", ["vgs", "vds", "id"], _fit_output_params, _report_output_params),
+    "ute": ("Select CSV File", ['vgs', 'rds', 'temp'], _fit_ute_utes_uted, _report_ute_utes_uted),
+    "rds_vgs": ("Select CSV File", ['vgs', 'rds', 'id'], _fit_rds_vgs_id, _report_rds_vgs_id),
+    "capacitance": ("Select Figure 5b CSV", ["vds", "c", "type"], _fit_capacitance_params, _report_capacitance_params),
+    "transfer": ("Select CSV (vgs, id, temp)", ["vgs", "id", "temp"], _fit_transfer_params, _report_transfer_params),
+    "lambdas": ("Select Output Characteristic CSV", ["vds", "id", "vgs"], _fit_lambdas, _report_lambdas),
+    "rth0": ("Select CSV File", ['Temp', 'Rds', 'Id'], _fit_rth0, _report_rth0),
+    "krsc": ("Select CSV File", ['Temp', 'Rds', 'Id'], _fit_krsc_krdc, _report_krsc_krdc),
+    "temp_vth": ("Select CSV (temp, vth)", ["temp", "vth"], _fit_temp_vth, _report_temp_vth),
+}
+
+
+def _ask_csv(title):
+    return filedialog.askopenfilename(parent=_get_root(), title=title, filetypes=[("CSV files", "*.csv")])
+
+
+# Load one extractor's CSV and run its fit. Module-level so it can be sent to
+# a worker process.
+def _fit_from_file(key, file_path, **fit_kwargs):
+    _load_numeric()
+    _, cols, fit, _ = _EXTRACTORS[key]
+    try:
+        data = _read_csv(file_path, cols)
+    except FileNotFoundError:
+        print("Error: CSV file not found.")
+        return None
+    except Exception as e:
+        print(f"Error reading CSV file: {e}")
+        return None
+    return fit(data, **fit_kwargs)
+
+
+# Extraction session: the CSV chosen and the parameters extracted for each
+# tool, saved to JSON after every successful run so a later session (or
+# "run all remaining") can skip work that is already done and feed earlier
+# results into later fits.
+SESSION_FILE = "asm_session.json"
+_SESSION = None
+
+# ASM-HEMT extraction order: DC output/transfer first, then capacitances,
+# temperature coefficients and finally the thermal network
+EXTRACTION_ORDER = ["output", "transfer", "lambdas", "rds_vgs", "capacitance",
+                    "ute", "krsc", "temp_vth", "rth0"]
+
+
+def _json_default(obj):
+    if hasattr(obj, "tolist"):  # numpy scalars and arrays
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _session():
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = {"files": {}, "params": {}}
+        if os.path.exists(SESSION_FILE):
+            try:
+                with open(SESSION_FILE) as f:
+                    _SESSION.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not read {SESSION_FILE} ({e}). Starting a new session.")
+    return _SESSION
+
+
+def _record_result(key, file_path, result):
+    session = _session()
+    session["files"][key] = file_path
+    session["params"][key] = result["params"]
+    with open(SESSION_FILE, "w") as f:
+        json.dump(session, f, indent=2, default=_json_default)
+
+
+def clear_session():
+    global _SESSION
+    _SESSION = {"files": {}, "params": {}}
+    if os.path.exists(SESSION_FILE):
+        os.remove(SESSION_FILE)
+    print("Cleared saved extraction results.")
+
+
+# Inputs one extractor takes from another's saved parameters
+def _fit_kwargs(key):
+    params = _session()["params"]
+    if key == "lambdas" and params.get("transfer", {}).get("VOFF") is not None:
+        return {"voff": params["transfer"]["VOFF"]}
+    return {}
+
+
+def _run_extractor(key, show_plot=True):
+    title, _, _, report = _EXTRACTORS[key]
+    file_path = _ask_csv(title)
+    if not file_path:
+        print("No file selected.")
+        return None
+
+    result = _fit_from_file(key, file_path, **_fit_kwargs(key))
+    if result is not None:
+        report(result, show_plot)
+        _record_result(key, file_path, result)
+    return result
+
+
+def extract_output_params(show_plot=True):
+    return _run_extractor("output", show_plot)
+
+
+def extract_ute_utes_uted(show_plot=True):
+    return _run_extractor("ute", show_plot)
+
+
+def extract_rds_vgs_id(show_plot=True):
+    return _run_extractor("rds_vgs", show_plot)
+
+
+def extract_capacitance_params(show_plot=True):
+    return _run_extractor("capacitance", show_plot)
+
+
+def extract_transfer_params(show_plot=True):
+    return _run_extractor("transfer", show_plot)
+
+
+def extract_lambdas(show_plot=True):
+    return _run_extractor("lambdas", show_plot)
+
+
+def extract_rth0(show_plot=True):
+    return _run_extractor("rth0", show_plot)
+
+
+def extract_krsc_krdc(show_plot=True):
+    return _run_extractor("krsc", show_plot)
+
+
+def extract_temp_vth(show_plot=True):
+    return _run_extractor("temp_vth", show_plot)
+
+
+# Batch mode: run every extractor without saved results, in EXTRACTION_ORDER.
+# All CSVs are picked up front and fitted in parallel worker processes; an
+# extractor that depends on another one in the same batch is submitted once
+# that result is in. Plotting and printing stay on the main thread (matplotlib
+# and Tk are not process-safe). Cancelling a dialog skips that extractor.
+_DEPENDS_ON = {"lambdas": "transfer"}
+
+
+def run_all_extractions(show_plot=True):
+    done = _session()["params"]
+    paths = {}
+    for key in EXTRACTION_ORDER:
+        if key in done:
+            print(f"Skipping {key}: already extracted (clear the session to redo it).")
+            continue
+        title = _EXTRACTORS[key][0]
+        file_path = _ask_csv(f"[{key}] {title}")
+        if file_path:
+            paths[key] = file_path
+        else:
+            print(f"Skipping {key}: no file selected.")
+    if not paths:
+        return {}
+    _load_numeric()
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+        futures = {
+            key: executor.submit(_fit_from_file, key, path, **_fit_kwargs(key))
+            for key, path in paths.items()
+            if _DEPENDS_ON.get(key) not in paths
+        }
+        for key, path in paths.items():
+            if key not in futures:
+                futures[key] = executor.submit(_fit_from_file, key, path, **_fit_kwargs(key))
+            try:
+                result = futures[key].result()
+            except Exception as e:
+                print(f"❌ {key} extraction failed: {e}")
+                continue
+            if result is not None:
+                print(f"\n=== {key} ===")
+                _EXTRACTORS[key][3](result, show_plot)
+                _record_result(key, path, result)
+                results[key] = result
+    return results
+
+
 # Main menu
+# Menu key -> extractor; 'q' maps to None and ends the loop
+DISPATCH = {
+    '1': extract_output_params,
+    '2': extract_ute_utes_uted,
+    '3': extract_rds_vgs_id,
+    '4': extract_capacitance_params,
+    '5': extract_transfer_params,
+    '6': extract_lambdas,
+    '7': extract_rth0,
+    '8': extract_krsc_krdc,
+    '9': extract_temp_vth,
+    'a': run_all_extractions,
+    'c': clear_session,
+    'q': None,
+}
+_INVALID = object()
+
+_MENU_TEXT = (
+    "\nSelect parameter extraction tool:\n"
+    "1. Output Characteristics Fit (RD0, MEXP)\n"
+    "2. RDS vs VGS Temp Dependence (UTE, UTES, UTED)\n"
+    "3. RDS vs VGS at constant Id\n"
+    "4. Capacitance Fit (CISS, COSS, CRSS)\n"
+    "5. Transfer Characteristics (VOFF, VSE, KP, UTE)\n"
+    "6. Channel Length Modulation (Lambda)\n"
+    "7. Thermal Resistance (RTH0)\n"
+    "8. RDS Temp Coefficients (KRSC, KRDC)\n"
+    "9. VTH vs Temperature (VOFF0, KVTO)\n"
+    "a. Run all remaining extractions (fits run in parallel)\n"
+    "c. Clear saved extraction results\n"
+    "q. Quit\n"
+)
+
+
 def main():
     while True:
-        print("\nSelect parameter extraction tool:")
-        print("1. Output Characteristics Fit (RD0, MEXP)")
-        print("2. RDS vs VGS Temp Dependence (UTE, UTES, UTED)")
-        print("3. RDS vs VGS at constant Id")
-        print("4. Capacitance Fit (CISS, COSS, CRSS)")
-        print("5. Transfer Characteristics (VOFF, VSE, KP, UTE)")
-        print("6. Channel Length Modulation (Lambda)")
-        print("7. Thermal Resistance (RTH0)")
-        print("8. RDS Temp Coefficients (KRSC, KRDC)")
-        print("9. VTH vs Temperature (VOFF0, KVTO)")
-        print("q. Quit")
-
-        choice = input("Enter choice: ").strip()
-
-        if choice == '1':
-            extract_output_params()
-        elif choice == '2':
-            extract_ute_utes_uted()
-        elif choice == '3':
-            extract_rds_vgs_id()
-        elif choice == '4':
-            extract_capacitance_params()
-        elif choice == '5':
-            extract_transfer_params()
-        elif choice == '6':
-            extract_lambdas()
-        elif choice == '7':
-            extract_rth0()
-        elif choice == '8':
-            extract_krsc_krdc()
-        elif choice == '9':
-            extract_temp_vth()
-        elif choice.lower() == 'q':
-            break
-        else:
+        sys.stdout.write(_MENU_TEXT)
+        sys.stdout.flush()
+
+        choice = input("Enter choice: ").strip().lower()
+
+        action = DISPATCH.get(choice, _INVALID)
+        if action is _INVALID:
             print("Invalid choice. Try again.")
+            continue
+        if action is None:
+            break
+        action()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
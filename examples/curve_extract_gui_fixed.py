@@ -10,52 +10,65 @@ import os
 import sys
 import csv
 import numpy as np
-from scipy.signal import savgol_filter
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
-from collections import defaultdict
+from collections import deque
+from functools import lru_cache, partial
 import logging
 import math
 import sqlite3
 import json
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.backends.backend_pdf import PdfPages
+import importlib.util
 from datetime import datetime
 
-# Try to import cv2 with proper error handling
-try:
-    import cv2
-except ImportError:
-    messagebox.showerror("Error", "OpenCV not installed. Please install with: pip install opencv-python")
-    sys.exit(1)
-
-# Try to import pdf2image with proper error handling
-try:
-    from pdf2image import convert_from_bytes
-    PDF2IMAGE_AVAILABLE = True
-except ImportError:
-    PDF2IMAGE_AVAILABLE = False
+# OpenCV, SciPy, Matplotlib and pdf2image are imported on first use (the graph
+# is built on first plot) so the Tk window comes up without paying for them
+_CV2 = None
+
+def _cv2():
+    """Import OpenCV on first use, with proper error handling"""
+    global _CV2
+    if _CV2 is None:
+        try:
+            import cv2 as _CV2
+        except ImportError:
+            messagebox.showerror("Error", "OpenCV not installed. Please install with: pip install opencv-python")
+            sys.exit(1)
+    return _CV2
+
+# Only probe for pdf2image here; it is imported where PDFs are handled
+PDF2IMAGE_AVAILABLE = importlib.util.find_spec("pdf2image") is not None
+if not PDF2IMAGE_AVAILABLE:
     print("Warning: pdf2image not available. PDF features will be disabled.")
 
 # Fixed TextHandler class
 class TextHandler(logging.Handler):
+    FLUSH_INTERVAL_MS = 50
+
     def __init__(self, text_widget):
         logging.Handler.__init__(self)
         self.text_widget = text_widget
+        self._buf = deque(maxlen=2000)
+        self._pending = False
 
     def emit(self, record):
-        msg = self.format(record)
-        def append():
-            self.text_widget.configure(state='normal')
-            self.text_widget.insert(tk.END, msg + '\n')
-            self.text_widget.see(tk.END)
-            self.text_widget.configure(state='disabled')
-        # Schedule the update in the main thread
-        self.text_widget.after(0, append)
+        # Buffer the record; the widget is updated at most once per interval
+        self._buf.append(self.format(record))
+        if not self._pending:
+            self._pending = True
+            # Schedule the update in the main thread
+            self.text_widget.after(self.FLUSH_INTERVAL_MS, self._flush)
+
+    def _flush(self):
+        self._pending = False
+        lines = [self._buf.popleft() for _ in range(len(self._buf))]
+        if not lines:
+            return
+        self.text_widget.configure(state='normal')
+        self.text_widget.insert(tk.END, '\n'.join(lines) + '\n')
+        self.text_widget.see(tk.END)
+        self.text_widget.configure(state='disabled')
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -155,74 +168,241 @@ def safe_float_conversion(value, default=0.0):
     except (ValueError, TypeError):
         return default
 
+# HSV bounds stacked into uint8 arrays once, row i belonging to COLOR_NAMES[i],
+# so masking never re-wraps the tuples
+COLOR_NAMES = list(color_ranges)
+COLOR_LO = np.array([color_ranges[name][0] for name in COLOR_NAMES], np.uint8)
+COLOR_HI = np.array([color_ranges[name][1] for name in COLOR_NAMES], np.uint8)
+
+# Every range shares one S/V band, so S and V are tested once for all colors
+# and each color then only checks the hue plane
+SHARED_SV = bool((COLOR_LO[:, 1:] == COLOR_LO[0, 1:]).all() and (COLOR_HI[:, 1:] == COLOR_HI[0, 1:]).all())
+SV_BAND_LO = np.array([0, *COLOR_LO[0, 1:]], np.uint8)
+SV_BAND_HI = np.array([255, *COLOR_HI[0, 1:]], np.uint8)
+
+def saturation_value_mask(hsv):
+    """Mask of the pixels inside the S/V band shared by every color range"""
+    return _cv2().inRange(hsv, SV_BAND_LO, SV_BAND_HI)
+
+def build_color_masks(hsv, sv_ok=None):
+    """Build one binary mask per base color from an HSV image
+    
+    The caller converts to HSV once and passes the buffer in; helpers must not
+    recompute it, so every color is tested against the same cache-hot pixels.
+    A precomputed saturation_value_mask can be passed as sv_ok to reuse it.
+    """
+    cv2 = _cv2()
+    if SHARED_SV:
+        if sv_ok is None:
+            sv_ok = saturation_value_mask(hsv)
+        hue = cv2.extractChannel(hsv, 0)
+    masks = {}
+    for i, name in enumerate(COLOR_NAMES):
+        if SHARED_SV:
+            mask = cv2.bitwise_and(cv2.inRange(hue, COLOR_LO[i, :1], COLOR_HI[i, :1]), sv_ok)
+        else:
+            mask = cv2.inRange(hsv, COLOR_LO[i], COLOR_HI[i])
+        base = color_to_base.get(name, name)
+        # 'red' and 'red2' straddle the hue wrap-around and share one mask
+        masks[base] = cv2.bitwise_or(masks[base], mask) if base in masks else mask
+    return masks
+
+def mask_points(mask):
+    """Return the (xs, ys) pixel coordinates of the set pixels in a mask
+    
+    Uses cv2.findNonZero rather than np.where, so the coordinates stay int32
+    (no int64 widening) all the way into the bincount binning.
+    """
+    pts = _cv2().findNonZero(mask)
+    if pts is None:
+        return np.empty(0, np.int32), np.empty(0, np.int32)
+    pts = pts.reshape(-1, 2)
+    return pts[:, 0], pts[:, 1]
+
+PDF_PREVIEW_DPI = 100
+
+def load_pdf_page(file_path, dpi=PDF_PREVIEW_DPI):
+    """Rasterize only the first page of a PDF straight into a BGR array"""
+    from pdf2image import convert_from_path
+    pages = convert_from_path(file_path, dpi=dpi, first_page=1, last_page=1, fmt='ppm')
+    if not pages:
+        raise ValueError("PDF has no pages")
+    cv2 = _cv2()
+    return cv2.cvtColor(np.asarray(pages[0].convert('RGB')), cv2.COLOR_RGB2BGR)
+
+def decode_image(file_path):
+    """Decode an image (or the first page of a PDF) into a BGR array"""
+    if file_path.lower().endswith('.pdf'):
+        return load_pdf_page(file_path)
+    # np.fromfile + imdecode handles non-ASCII paths, unlike cv2.imread
+    cv2 = _cv2()
+    bgr = cv2.imdecode(np.fromfile(file_path, np.uint8), cv2.IMREAD_COLOR)
+    if bgr is None:
+        raise ValueError("OpenCV could not decode the image")
+    return bgr
+
+def _linear_axis(pixels, lo, step):
+    return lo + step * pixels
+
+def _log_axis(pixels, log_lo, step):
+    return 10 ** (log_lo + step * pixels)
+
+def make_axis_transform(n_pixels, lo, hi, scale_type='linear'):
+    """Build a vectorized map from pixel offsets in [0, n_pixels] onto [lo, hi]
+    
+    The scale-type branch and the per-axis constants are resolved once, so the
+    returned callable is a single array expression for every color.
+    """
+    if scale_type == 'log':
+        log_lo = np.log10(lo)
+        return partial(_log_axis, log_lo=log_lo, step=(np.log10(hi) - log_lo) / n_pixels)
+    return partial(_linear_axis, lo=lo, step=(hi - lo) / n_pixels)
+
+def bin_curve(xs, ys, x_min, bin_size=BIN_SIZE, min_count=1):
+    """Average ys per x bin with np.bincount, dropping bins below min_count
+    
+    Only occupied bins are counted, so memory follows the number of points
+    rather than the span of x (which is huge on a log axis).
+    """
+    bins, inverse = np.unique(np.rint((xs - x_min) / bin_size).astype(np.int64), return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.bincount(inverse, weights=ys)
+    valid = counts >= min_count
+    return x_min + bins[valid] * bin_size, sums[valid] / counts[valid]
+
+@lru_cache(maxsize=32)
+def _sg_coeffs(window, polyorder=SMOOTH_POLYORDER):
+    """Savitzky-Golay FIR coefficients, computed once per window size"""
+    from scipy.signal import savgol_coeffs
+    return savgol_coeffs(window, polyorder)
+
+def smooth_curve(y, window):
+    """Savitzky-Golay smoothing as a single convolution with cached coefficients"""
+    window = int(window) | 1  # the filter needs an odd window
+    if window <= SMOOTH_POLYORDER or len(y) <= window:
+        return np.asarray(y, dtype=float)
+    from scipy.ndimage import convolve1d
+    return convolve1d(np.asarray(y, dtype=float), _sg_coeffs(window), mode='nearest')
+
+_EXPORT_FIG = None
+
+def _export_figure():
+    """Off-screen Agg figure reused for every PDF export"""
+    global _EXPORT_FIG
+    if _EXPORT_FIG is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _EXPORT_FIG = Figure(figsize=(6, 4), dpi=150)
+        FigureCanvasAgg(_EXPORT_FIG)
+        _EXPORT_FIG.add_subplot(111)
+    return _EXPORT_FIG
+
+def export_curves_pdf(pdf_path, curve_data, representations, x_axis_name, y_axis_name,
+                      x_scale_type='linear', y_scale_type='linear'):
+    """Render extracted curves to a PDF without touching the Tk canvas"""
+    from matplotlib.backends.backend_pdf import PdfPages
+    fig = _export_figure()
+    ax = fig.axes[0]
+    try:
+        ax.set_xscale(x_scale_type)
+        ax.set_yscale(y_scale_type)
+        for color, data in curve_data.items():
+            ax.plot(data['x'], data['y'], color=display_colors.get(color, 'g'),
+                    label=representations.get(color, color))
+        ax.set_xlabel(x_axis_name)
+        ax.set_ylabel(y_axis_name)
+        ax.grid(True, which="both", ls="--", alpha=0.7)
+        if curve_data:
+            ax.legend()
+        fig.tight_layout()
+        with PdfPages(pdf_path) as pdf:
+            pdf.savefig(fig)
+    finally:
+        ax.cla()
+    logger.info(f"Curves exported to: {pdf_path}")
+    return pdf_path
+
+CURVE_DATA_COLUMNS = (
+    'product_id', 'timestamp', 'png_file', 'csv_file', 'pdf_file', 'json_file',
+    'graph_type', 'x_axis_name', 'y_axis_name', 'third_col_name',
+    'x_min', 'x_max', 'y_min', 'y_max', 'x_scale', 'y_scale',
+    'x_scale_type', 'y_scale_type', 'min_size'
+)
+SQL_INSERT_CURVE = "INSERT INTO curve_data ({}) VALUES ({})".format(
+    ", ".join(CURVE_DATA_COLUMNS), ", ".join("?" * len(CURVE_DATA_COLUMNS)))
+
+BLOB_COLUMNS = ('png_file', 'csv_file', 'pdf_file', 'json_file')
+BLOB_CHUNK_SIZE = 64 * 1024
+
+@lru_cache(maxsize=None)
+def sql_insert_curve_zeroblob(streamed):
+    """SQL_INSERT_CURVE with the streamed BLOB columns preallocated
+
+    Columns in streamed take a byte length and are filled with zeroblob() so
+    file contents can be written in afterwards; every other column, including
+    BLOB columns without a file, binds its value directly.
+    """
+    return "INSERT INTO curve_data ({}) VALUES ({})".format(
+        ", ".join(CURVE_DATA_COLUMNS),
+        ", ".join("zeroblob(?)" if col in streamed else "?" for col in CURVE_DATA_COLUMNS))
+
+SQL_UPDATE_BLOB = {col: f"UPDATE curve_data SET {col} = ? WHERE id = ?" for col in BLOB_COLUMNS}
+
+def configure_connection(conn):
+    """Apply WAL journaling and the cache pragmas to a connection"""
+    # journal_mode is stored in the file; the others are per connection
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    return conn
+
+def connect_database():
+    """Open a configured connection to DB_PATH
+    
+    Connections run in autocommit mode with explicit BEGIN for writes, and a
+    larger statement cache so the constant SQL_* statements stay prepared.
+    """
+    return configure_connection(sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=256))
+
+def save_many(conn, rows):
+    """Insert curve_data rows (ordered as CURVE_DATA_COLUMNS) in one transaction"""
+    conn.execute("BEGIN")
+    with conn:
+        conn.executemany(SQL_INSERT_CURVE, rows)
+
+def save_curve_record(conn, fields, files):
+    """Insert one curve_data row, streaming files into its BLOB columns
+    
+    fields maps the other columns to values and files maps BLOB columns to
+    paths. Files are copied in BLOB_CHUNK_SIZE pieces through incremental
+    BLOB I/O instead of being read whole into memory first.
+    """
+    sizes = {col: os.path.getsize(path) for col, path in files.items()}
+    values = [sizes[col] if col in sizes else fields.get(col) for col in CURVE_DATA_COLUMNS]
+    conn.execute("BEGIN")
+    with conn:
+        rowid = conn.execute(sql_insert_curve_zeroblob(frozenset(sizes)), values).lastrowid
+        for col, path in files.items():
+            with open(path, 'rb') as f:
+                if not hasattr(conn, 'blobopen'):  # Python < 3.11
+                    conn.execute(SQL_UPDATE_BLOB[col], (f.read(), rowid))
+                    continue
+                with conn.blobopen('curve_data', col, rowid) as blob:
+                    while chunk := f.read(BLOB_CHUNK_SIZE):
+                        blob.write(chunk)
+    return rowid
+
 def init_database():
     """Initialize database with proper error handling"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect_database()
         c = conn.cursor()
         
-        # Create tables with proper error handling
-        c.execute('''CREATE TABLE IF NOT EXISTS products (
-            product_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_name TEXT NOT NULL,
-            configuration TEXT,
-            manufacturer TEXT,
-            voltage_rating TEXT
-        )''')
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS curve_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_id INTEGER,
-            timestamp TEXT,
-            png_file BLOB,
-            csv_file BLOB,
-            pdf_file BLOB,
-            json_file BLOB,
-            graph_type TEXT,
-            x_axis_name TEXT,
-            y_axis_name TEXT,
-            third_col_name TEXT,
-            x_min REAL,
-            x_max REAL,
-            y_min REAL,
-            y_max REAL,
-            x_scale REAL,
-            y_scale REAL,
-            x_scale_type TEXT,
-            y_scale_type TEXT,
-            min_size INTEGER,
-            FOREIGN KEY (product_id) REFERENCES products (product_id)
-        )''')
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS graph_types (
-            name TEXT PRIMARY KEY,
-            x_axis TEXT,
-            y_axis TEXT,
-            third_col TEXT,
-            x_min REAL,
-            x_max REAL,
-            y_min REAL,
-            y_max REAL,
-            x_scale REAL,
-            y_scale REAL,
-            x_scale_type TEXT,
-            y_scale_type TEXT,
-            color_reps TEXT,
-            output_filename TEXT
-        )''')
-        
-        # Check and add missing columns
-        c.execute("PRAGMA table_info(curve_data)")
-        columns = [col[1] for col in c.fetchall()]
-        if 'product_id' not in columns:
-            c.execute("ALTER TABLE curve_data ADD COLUMN product_id INTEGER")
-            
-        c.execute("PRAGMA table_info(products)")
-        columns = [col[1] for col in c.fetchall()]
-        if 'voltage_rating' not in columns:
-            c.execute("ALTER TABLE products ADD COLUMN voltage_rating TEXT")
-            
-        conn.commit()
+        # Begin explicitly and let the context manager commit or roll back
+        c.execute("BEGIN")
+        with conn:
+            _create_schema(c)
         conn.close()
         logger.info("Database initialized successfully")
         
@@ -230,6 +410,69 @@ def init_database():
         logger.error(f"Database initialization failed: {e}")
         raise
 
+def _create_schema(c):
+    """Create the tables and add columns missing from older databases"""
+    # Create tables with proper error handling
+    c.execute('''CREATE TABLE IF NOT EXISTS products (
+        product_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_name TEXT NOT NULL,
+        configuration TEXT,
+        manufacturer TEXT,
+        voltage_rating TEXT
+    )''')
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS curve_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_id INTEGER,
+        timestamp TEXT,
+        png_file BLOB,
+        csv_file BLOB,
+        pdf_file BLOB,
+        json_file BLOB,
+        graph_type TEXT,
+        x_axis_name TEXT,
+        y_axis_name TEXT,
+        third_col_name TEXT,
+        x_min REAL,
+        x_max REAL,
+        y_min REAL,
+        y_max REAL,
+        x_scale REAL,
+        y_scale REAL,
+        x_scale_type TEXT,
+        y_scale_type TEXT,
+        min_size INTEGER,
+        FOREIGN KEY (product_id) REFERENCES products (product_id)
+    )''')
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS graph_types (
+        name TEXT PRIMARY KEY,
+        x_axis TEXT,
+        y_axis TEXT,
+        third_col TEXT,
+        x_min REAL,
+        x_max REAL,
+        y_min REAL,
+        y_max REAL,
+        x_scale REAL,
+        y_scale REAL,
+        x_scale_type TEXT,
+        y_scale_type TEXT,
+        color_reps TEXT,
+        output_filename TEXT
+    )''')
+    
+    # Check and add missing columns
+    c.execute("PRAGMA table_info(curve_data)")
+    columns = [col[1] for col in c.fetchall()]
+    if 'product_id' not in columns:
+        c.execute("ALTER TABLE curve_data ADD COLUMN product_id INTEGER")
+        
+    c.execute("PRAGMA table_info(products)")
+    columns = [col[1] for col in c.fetchall()]
+    if 'voltage_rating' not in columns:
+        c.execute("ALTER TABLE products ADD COLUMN voltage_rating TEXT")
+
 # Keep the rest of the functions but add this note:
 # The remaining functions (auto_detect_grid_size, save_curve_data, process_image) 
 # would be included here with similar error handling improvements
@@ -249,9 +492,14 @@ class CurveExtractionApp:
         
         # Initialize variables
         self.photo = None
+        self._bgr = None
+        self._rgb = None
+        self._sv_ok = None
         self.curve_data = None
         self.representations = {}
         self.thumbnail_photos = []
+        self._last_cfg = (0, 0)
+        self._center_job = None
         
         # Set up styling
         style = ttk.Style()
@@ -262,7 +510,8 @@ class CurveExtractionApp:
         # Initialize database with error handling
         try:
             init_database()
-            self.conn = sqlite3.connect(DB_PATH)
+            # One long-lived connection for the whole session
+            self.conn = connect_database()
             self.cursor = self.conn.cursor()
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to initialize database: {e}")
@@ -279,6 +528,7 @@ class CurveExtractionApp:
         
         ttk.Button(top_bar, text="Load Image", command=self.load_image).pack(side=tk.LEFT, padx=2)
         ttk.Button(top_bar, text="Process Image", command=self.process_image).pack(side=tk.LEFT, padx=2)
+        ttk.Button(top_bar, text="Export PDF", command=self.export_pdf).pack(side=tk.LEFT, padx=2)
         ttk.Button(top_bar, text="Clear", command=self.clear_all).pack(side=tk.LEFT, padx=2)
         
         self.status_label = ttk.Label(top_bar, text="Ready")
@@ -316,10 +566,16 @@ class CurveExtractionApp:
         
         # Graph display
         ttk.Label(left_panel, text="Extracted Graph").pack()
-        self.fig = Figure(figsize=(5, 3.5), dpi=100)
-        self.ax = self.fig.add_subplot(111)
-        self.graph_canvas = FigureCanvasTkAgg(self.fig, master=left_panel)
-        self.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=5)
+        # The Matplotlib figure is built into this frame on first plot
+        self.graph_frame = ttk.Frame(left_panel, width=500, height=350)
+        self.graph_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.fig = self.ax = self.graph_canvas = None
+        self._graph_axes = None
+        
+        # Curves are animated artists blitted over a cached axes background;
+        # every full redraw (resize, axis change) re-grabs that background
+        self._curve_lines = {}
+        self._graph_bg = None
         
         # Right panel for controls
         right_panel = ttk.Frame(main_container)
@@ -355,14 +611,34 @@ class CurveExtractionApp:
             controls_canvas.configure(scrollregion=controls_canvas.bbox("all"))
         self.controls_frame.bind("<Configure>", configure_scroll_region)
         
-        # Bind mousewheel to canvas for scrolling
+        # Bind mousewheel to canvas for scrolling; wheel events only accumulate
+        # their delta and a single scroll is flushed per event-loop iteration
+        self.controls_canvas = controls_canvas
+        self._wheel_accum = 0.0
+        self._wheel_pending = False
         def on_mousewheel(event):
-            controls_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            self._wheel_accum -= event.delta / 120
+            if not self._wheel_pending:
+                self._wheel_pending = True
+                self.root.after_idle(self._flush_wheel)
         controls_canvas.bind("<MouseWheel>", on_mousewheel)
         
         # Now add all the control sections to the scrollable frame
         self.add_control_sections()
         
+    def _flush_wheel(self):
+        """Apply the accumulated mousewheel delta as one scroll"""
+        self._wheel_pending = False
+        units = int(self._wheel_accum)
+        if not units:
+            return  # keep sub-unit trackpad deltas for the next event
+        self._wheel_accum -= units
+        
+        # Nothing to scroll when the controls fit in the visible canvas
+        bbox = self.controls_canvas.bbox("all")
+        if bbox and bbox[3] > self.controls_canvas.winfo_height():
+            self.controls_canvas.yview_scroll(units, "units")
+            
     def add_control_sections(self):
         """Add all control sections to the scrollable frame"""
         # Graph type selection
@@ -514,6 +790,17 @@ class CurveExtractionApp:
         self.color_reps_frame.pack(fill=tk.X, padx=5, pady=5)
         self.color_rep_entries = {}
         
+        # Fixed pool of rows, one per possible color; presets only relabel and
+        # show/hide them instead of destroying and recreating widgets
+        self._color_rep_pool = []
+        for _ in color_ranges:
+            frame = ttk.Frame(self.color_reps_frame)
+            label = ttk.Label(frame)
+            label.pack(side=tk.LEFT)
+            entry = ttk.Entry(frame, width=15)
+            entry.pack(side=tk.RIGHT, fill=tk.X, expand=True)
+            self._color_rep_pool.append((frame, label, entry))
+        
         # Log output with FIXED scrollbar
         log_frame = ttk.LabelFrame(self.controls_frame, text="Log")
         log_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -536,37 +823,50 @@ class CurveExtractionApp:
         
     def load_image(self):
         """Load and display an image with proper validation"""
-        file_path = filedialog.askopenfilename(
-            title="Select Image File",
-            filetypes=[
-                ("Image files", "*.png *.jpg *.jpeg *.bmp *.tiff"),
-                ("PNG files", "*.png"),
-                ("JPEG files", "*.jpg *.jpeg"),
-                ("All files", "*.*")
-            ]
-        )
+        filetypes = [
+            ("Image files", "*.png *.jpg *.jpeg *.bmp *.tiff"),
+            ("PNG files", "*.png"),
+            ("JPEG files", "*.jpg *.jpeg"),
+            ("All files", "*.*")
+        ]
+        if PDF2IMAGE_AVAILABLE:
+            filetypes.insert(1, ("PDF files", "*.pdf"))
+        file_path = filedialog.askopenfilename(title="Select Image File", filetypes=filetypes)
         
         if not file_path:
             return
             
+        is_pdf = file_path.lower().endswith('.pdf')
+        if is_pdf and not PDF2IMAGE_AVAILABLE:
+            messagebox.showerror("Error", "PDF support requires pdf2image and Poppler.")
+            return
+            
         # Validate the image file
-        if not validate_image_file(file_path):
+        if not is_pdf and not validate_image_file(file_path):
             messagebox.showerror("Error", "Invalid image file or corrupted image.")
             return
             
         try:
-            # Load and resize image
-            self.image = Image.open(file_path)
-            self.image = self.image.resize((self.canvas_w, self.canvas_h), Image.Resampling.LANCZOS)
-            self.photo = ImageTk.PhotoImage(self.image)
+            # Decode once and keep the full-resolution BGR array for processing;
+            # PDFs go through the same cv2 pipeline from their first page
+            cv2 = _cv2()
+            bgr = decode_image(file_path)
+            self._bgr = bgr
+            self._sv_ok = None
+
+            # INTER_AREA is the fast, alias-free choice for downscaled previews
+            arr = cv2.resize(bgr, (self.canvas_w, self.canvas_h), interpolation=cv2.INTER_AREA)
+            # The arrays are the source of truth; the Pillow wrapper is only a
+            # temporary handed straight to PhotoImage
+            self._rgb = cv2.cvtColor(arr, cv2.COLOR_BGR2RGB)
+            self.photo = ImageTk.PhotoImage(Image.fromarray(self._rgb))
             
             # Clear canvas and display image
             self.input_canvas.delete("all")
             self.center_image()
             
             # Clear previous graph
-            self.ax.clear()
-            self.graph_canvas.draw()
+            self.update_curves({})
             
             # Update status and store file path
             self.status_label.config(text=f"Image loaded: {os.path.basename(file_path)}")
@@ -580,10 +880,27 @@ class CurveExtractionApp:
             logger.error(f"Failed to load image: {str(e)}")
             
     def center_image(self, event=None):
-        """Center the image in the canvas with division by zero protection"""
+        """Schedule re-centering, ignoring <Configure> events that barely resize"""
         if not hasattr(self, 'photo') or not self.photo:
             return
             
+        if event is not None:
+            width, height = event.width, event.height
+            if abs(width - self._last_cfg[0]) < 4 and abs(height - self._last_cfg[1]) < 4:
+                return
+            self._last_cfg = (width, height)
+            
+        # Collapse a drag-resize burst into a single redraw
+        if self._center_job is not None:
+            self.root.after_cancel(self._center_job)
+        self._center_job = self.root.after_idle(self._do_center)
+        
+    def _do_center(self):
+        """Center the image in the canvas with division by zero protection"""
+        self._center_job = None
+        if not self.photo:
+            return
+            
         try:
             # Get canvas dimensions (with minimum size protection)
             canvas_width = max(self.input_canvas.winfo_width(), 1)
@@ -597,13 +914,84 @@ class CurveExtractionApp:
             x = max(0, (canvas_width - img_width) // 2)
             y = max(0, (canvas_height - img_height) // 2)
             
-            # Clear and redraw
-            self.input_canvas.delete("all")
-            self.input_canvas.create_image(x, y, anchor="nw", image=self.photo)
+            # Move the existing image item instead of deleting and recreating it
+            if self.input_canvas.find_withtag("input_image"):
+                self.input_canvas.coords("input_image", x, y)
+                self.input_canvas.itemconfigure("input_image", image=self.photo)
+            else:
+                self.input_canvas.create_image(x, y, anchor="nw", image=self.photo, tags="input_image")
             
         except Exception as e:
             logger.error(f"Error centering image: {e}")
             
+    def _ensure_graph(self):
+        """Import Matplotlib and build the graph canvas the first time it is needed"""
+        if self.graph_canvas is not None:
+            return
+        import matplotlib
+        matplotlib.use('TkAgg')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.fig = Figure(figsize=(5, 3.5), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.graph_canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
+        self.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.graph_canvas.mpl_connect('draw_event', self._on_graph_draw)
+        if self._graph_axes is not None:
+            xlim, ylim, x_scale_type, y_scale_type = self._graph_axes
+            self.ax.set_xscale(x_scale_type)
+            self.ax.set_yscale(y_scale_type)
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(*ylim)
+        self.graph_canvas.draw()
+        
+    def _on_graph_draw(self, event=None):
+        """Cache the static axes background after a full redraw"""
+        self._graph_bg = self.graph_canvas.copy_from_bbox(self.fig.bbox)
+        for line in self._curve_lines.values():
+            self.ax.draw_artist(line)
+            
+    def update_curves(self, curves):
+        """Redraw only the curve artists over the cached axes background"""
+        if self.graph_canvas is None:
+            if not curves:
+                return
+            self._ensure_graph()
+        for color, line in self._curve_lines.items():
+            if color not in curves:
+                line.set_data([], [])
+        for color, (x, y) in curves.items():
+            line = self._curve_lines.get(color)
+            if line is None:
+                line, = self.ax.plot([], [], color=display_colors.get(color, color), animated=True)
+                self._curve_lines[color] = line
+            line.set_data(x, y)
+            
+        if self._graph_bg is None:
+            self.graph_canvas.draw()
+            return
+        self.graph_canvas.restore_region(self._graph_bg)
+        for line in self._curve_lines.values():
+            self.ax.draw_artist(line)
+        self.graph_canvas.blit(self.fig.bbox)
+        
+    def _set_graph_axes(self, xlim, ylim, x_scale_type, y_scale_type):
+        """Apply axis limits/scales, redrawing fully only when they change"""
+        # Limits and scales live in the cached background, so this is the
+        # one place that needs a full redraw; before the first plot they are
+        # only remembered for _ensure_graph
+        self._graph_axes = (xlim, ylim, x_scale_type, y_scale_type)
+        if self.graph_canvas is None:
+            return
+        if (self.ax.get_xscale(), self.ax.get_yscale()) == (x_scale_type, y_scale_type) \
+                and self.ax.get_xlim() == tuple(xlim) and self.ax.get_ylim() == tuple(ylim):
+            return
+        self.ax.set_xscale(x_scale_type)
+        self.ax.set_yscale(y_scale_type)
+        self.ax.set_xlim(*xlim)
+        self.ax.set_ylim(*ylim)
+        self.graph_canvas.draw()
+        
     def update_graph_type(self, event=None):
         """Update UI based on selected graph type"""
         graph_type = self.graph_type_var.get()
@@ -650,27 +1038,40 @@ class CurveExtractionApp:
         # Update color representations
         self.update_color_representations(preset.get('color_reps', {}))
         
+        self._set_graph_axes(
+            (preset['x_min'] * preset['x_scale'], preset['x_max'] * preset['x_scale']),
+            (preset['y_min'] * preset['y_scale'], preset['y_max'] * preset['y_scale']),
+            preset.get('x_scale_type', 'linear'), preset.get('y_scale_type', 'linear'))
+        
         logger.info(f"Graph type changed to: {graph_type}")
         
     def update_color_representations(self, color_reps):
         """Update color representation entries"""
-        # Clear existing entries
-        for widget in self.color_reps_frame.winfo_children():
-            widget.destroy()
         self.color_rep_entries = {}
+        items = list(color_reps.items())
         
-        # Add new entries for each color
-        for color, rep in color_reps.items():
-            frame = ttk.Frame(self.color_reps_frame)
-            frame.pack(fill=tk.X, padx=3, pady=2)
-            
-            ttk.Label(frame, text=f"{color.capitalize()}:").pack(side=tk.LEFT)
-            entry = ttk.Entry(frame, width=15)
-            entry.pack(side=tk.RIGHT, fill=tk.X, expand=True)
+        for i, (frame, label, entry) in enumerate(self._color_rep_pool):
+            if i >= len(items):
+                frame.pack_forget()
+                continue
+                
+            color, rep = items[i]
+            label.config(text=f"{color.capitalize()}:")
+            entry.delete(0, tk.END)
             entry.insert(0, str(rep))
-            
+            # Visible rows are always a prefix of the pool, so packing only the
+            # unmapped ones keeps them in order
+            if not frame.winfo_manager():
+                frame.pack(fill=tk.X, padx=3, pady=2)
+                
             self.color_rep_entries[color] = entry
         
+    def _bgr_for_processing(self):
+        """Return the full-resolution BGR image decoded by load_image"""
+        if self._bgr is None:
+            self._bgr = decode_image(self.file_path)
+        return self._bgr
+        
     def process_image(self):
         """Process the loaded image (simplified version)"""
         if not hasattr(self, 'file_path'):
@@ -682,23 +1083,100 @@ class CurveExtractionApp:
             # the complete image processing pipeline from the original
             logger.info("Starting image processing...")
             self.status_label.config(text="Processing image...")
+
+            x_min = safe_float_conversion(self.x_min_entry.get(), 0.0)
+            x_max = safe_float_conversion(self.x_max_entry.get(), 10.0)
+            y_min = safe_float_conversion(self.y_min_entry.get(), 0.0)
+            y_max = safe_float_conversion(self.y_max_entry.get(), 100.0)
+            x_scale = safe_float_conversion(self.x_scale_entry.get(), 1.0)
+            y_scale = safe_float_conversion(self.y_scale_entry.get(), 1.0)
+            x_scale_type = self.x_scale_type.get()
+            y_scale_type = self.y_scale_type.get()
+            bin_size = safe_float_conversion(self.bin_size.get(), BIN_SIZE)
+            if x_max <= x_min or y_max <= y_min:
+                raise ValueError("Max values must be greater than min values")
+            if x_scale_type == 'log' and x_min <= 0:
+                raise ValueError("X-axis min and max must be positive for logarithmic scale")
+            if y_scale_type == 'log' and y_min <= 0:
+                raise ValueError("Y-axis min and max must be positive for logarithmic scale")
+            if bin_size <= 0:
+                raise ValueError("Bin size must be positive")
+            
+            # The simplified pipeline treats the loaded image as the plot area
+            bgr = self._bgr_for_processing()
+            height, width = bgr.shape[:2]
             
-            # Placeholder for actual processing
-            messagebox.showinfo("Info", "Image processing functionality would be implemented here")
+            # Color selection is done with cv2.inRange on one HSV buffer,
+            # converted once here and never by iterating over pixels in Python
+            cv2 = _cv2()
+            hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+            # The S/V band does not depend on the hue settings, so its mask is
+            # kept for re-runs on the same image
+            if self._sv_ok is None:
+                self._sv_ok = saturation_value_mask(hsv)
+            masks = build_color_masks(hsv, self._sv_ok)
+            
+            xform_x = make_axis_transform(width, x_min, x_max, x_scale_type)
+            xform_y = make_axis_transform(height, y_min, y_max, y_scale_type)
+            self.curve_data = {}
+            for color, mask in masks.items():
+                xs, ys = mask_points(mask)
+                if not len(xs):
+                    continue
+                logger.debug(f"Detected {len(xs)} points for color {color}")
+                
+                logical_x = xform_x(xs)
+                logical_y = xform_y(height - ys)
+                final_x, final_y = bin_curve(logical_x, logical_y, x_min, bin_size)
+                smooth_y = smooth_curve(final_y, self.smooth_window.get())
+                self.curve_data[color] = {'x': final_x * x_scale, 'y': smooth_y * y_scale}
+                
+            self._set_graph_axes((x_min * x_scale, x_max * x_scale), (y_min * y_scale, y_max * y_scale),
+                                 x_scale_type, y_scale_type)
+            self.update_curves({color: (data['x'], data['y']) for color, data in self.curve_data.items()})
+            
+            self.status_label.config(text=f"Extracted {len(self.curve_data)} curves")
+            logger.info(f"Extracted curves: {', '.join(sorted(self.curve_data)) or 'none'}")
             
         except Exception as e:
             messagebox.showerror("Error", f"Processing failed: {str(e)}")
             logger.error(f"Processing failed: {str(e)}")
             
+    def export_pdf(self):
+        """Export the extracted curves to a PDF file"""
+        if not self.curve_data:
+            messagebox.showwarning("Warning", "Please process an image first!")
+            return
+            
+        pdf_path = filedialog.asksaveasfilename(
+            title="Export Curves", defaultextension=".pdf",
+            initialfile=f"{self.output_filename_entry.get() or 'output'}.pdf",
+            filetypes=[("PDF files", "*.pdf")])
+        if not pdf_path:
+            return
+            
+        try:
+            self.representations = {color: entry.get() or color
+                                    for color, entry in self.color_rep_entries.items()}
+            export_curves_pdf(pdf_path, self.curve_data, self.representations,
+                              self.x_axis_entry.get() or "X", self.y_axis_entry.get() or "Y",
+                              self.x_scale_type.get(), self.y_scale_type.get())
+            self.status_label.config(text=f"Exported: {os.path.basename(pdf_path)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Export failed: {str(e)}")
+            logger.error(f"Export failed: {str(e)}")
+            
     def clear_all(self):
         """Clear all data and reset the interface"""
         try:
             self.input_canvas.delete("all")
-            self.ax.clear()
-            self.graph_canvas.draw()
+            self.update_curves({})
             
             # Reset variables
             self.photo = None
+            self._bgr = None
+            self._rgb = None
+            self._sv_ok = None
             self.curve_data = None
             self.representations = {}
             
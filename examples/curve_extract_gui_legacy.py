@@ -3,11 +3,16 @@ import sys
 import csv
 import cv2
 import numpy as np
-from scipy.signal import savgol_filter
+from scipy.signal import savgol_coeffs
+from scipy.ndimage import convolve1d, uniform_filter1d
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+import locale
 import logging
 import math
 import sqlite3
@@ -18,18 +23,39 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
-from io import BytesIO
+from io import BytesIO, StringIO
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the jitted helpers run as plain Python without it
+    def njit(*args, **kwargs):
+        return lambda func: func
+    prange = range
 
 # Custom logging handler for Text widget
 class TextHandler(logging.Handler):
+    FLUSH_INTERVAL_MS = 50
+
     def __init__(self, text_widget):
         logging.Handler.__init__(self)
         self.text_widget = text_widget
+        self._buf = deque(maxlen=2000)
+        self._pending = False
 
     def emit(self, record):
-        msg = self.format(record)
+        # Buffer the record; the widget is updated at most once per interval
+        self._buf.append(self.format(record))
+        if not self._pending:
+            self._pending = True
+            self.text_widget.after(self.FLUSH_INTERVAL_MS, self._flush)
+
+    def _flush(self):
+        self._pending = False
+        lines = [self._buf.popleft() for _ in range(len(self._buf))]
+        if not lines:
+            return
         self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, msg + '\n')
+        self.text_widget.insert(tk.END, '\n'.join(lines) + '\n')
         self.text_widget.see(tk.END)
         self.text_widget.configure(state='disabled')
 
@@ -44,6 +70,11 @@ MIN_GRID_SIZE = 5
 MAX_GRID_SIZE = 50
 SMOOTH_POLYORDER = 3
 MIN_VALID_BIN_COUNT = 60
+IMAGE_CACHE_SIZE = 2
+HOUGH_SIZE = 512
+MAX_COLOR_WORKERS = 4
+THUMB_CACHE_SIZE = 256
+SEARCH_DEBOUNCE_MS = 150
 SCRIPT_DIR = os.path.dirname(os.path.abspath(sys.argv[0]))
 DB_PATH = os.path.join(SCRIPT_DIR, "curve_data.db")
 
@@ -86,6 +117,36 @@ color_to_base = {
     'purple': 'purple'
 }
 
+# Whole-image stages (grayscale/Canny, warp, HSV) run through OpenCL when a
+# device is available; UMat inputs dispatch there and results are fetched back
+USE_OPENCL = cv2.ocl.haveOpenCL()
+cv2.ocl.setUseOpenCL(USE_OPENCL)
+
+def to_device(image):
+    return cv2.UMat(image) if USE_OPENCL else image
+
+def to_host(image):
+    return image.get() if isinstance(image, cv2.UMat) else image
+
+# Hue ranges overlap (e.g. red/orange, blue/purple), so each hue maps to a
+# bit set of matching colors rather than a single label. Colors sharing the
+# same saturation/value bounds are grouped so their S/V test runs once.
+HUE_COLOR_BITS = np.zeros(256, np.uint16)
+_sv_groups = {}
+for _cid, (_lo, _hi) in enumerate(color_ranges.values()):
+    HUE_COLOR_BITS[_lo[0]:_hi[0] + 1] |= 1 << _cid
+    _sv_key = ((0,) + tuple(_lo[1:]), (255,) + tuple(_hi[1:]))
+    _sv_groups[_sv_key] = _sv_groups.get(_sv_key, 0) | (1 << _cid)
+SV_COLOR_GROUPS = [(np.array(lo, np.uint8), np.array(hi, np.uint8), bits)
+                   for (lo, hi), bits in _sv_groups.items()]
+
+def classify_colors(hsv):
+    """Return a uint16 image whose bit i is set where color_ranges entry i matches"""
+    labels = HUE_COLOR_BITS[hsv[..., 0]]
+    for sv_lo, sv_hi, bits in SV_COLOR_GROUPS:
+        labels[cv2.inRange(hsv, sv_lo, sv_hi) == 0] &= ~np.uint16(bits)
+    return labels
+
 # Graph type presets
 GRAPH_PRESETS = {
     'output': {
@@ -135,9 +196,75 @@ GRAPH_PRESETS = {
     }
 }
 
-def init_database():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+CURVE_DATA_COLUMNS = (
+    'product_id', 'timestamp', 'png_file', 'csv_file', 'pdf_file', 'json_file',
+    'graph_type', 'x_axis_name', 'y_axis_name', 'third_col_name',
+    'x_min', 'x_max', 'y_min', 'y_max', 'x_scale', 'y_scale',
+    'x_scale_type', 'y_scale_type', 'min_size'
+)
+SQL_INSERT_CURVE = "INSERT INTO curve_data ({}) VALUES ({})".format(
+    ", ".join(CURVE_DATA_COLUMNS), ", ".join("?" * len(CURVE_DATA_COLUMNS)))
+# Graph types stored in the database other than the built-in presets
+SQL_SELECT_CUSTOM_GRAPH_TYPES = "SELECT name FROM graph_types WHERE name NOT IN ({})".format(
+    ", ".join("?" * len(GRAPH_PRESETS)))
+SQL_SELECT_PDF = "SELECT pdf_file FROM curve_data WHERE id = ?"
+SQL_SELECT_CURVES = "SELECT id, timestamp FROM curve_data WHERE product_id = ?"
+SQL_SELECT_PRODUCT_ID = "SELECT product_id FROM products WHERE product_name = ?"
+SQL_SELECT_PRODUCT_NAMES = "SELECT DISTINCT product_name FROM products"
+# One statement for every filter combination: an unset filter binds NULL
+SQL_SEARCH_PRODUCTS = """SELECT DISTINCT product_name FROM products
+    WHERE (:s IS NULL OR product_name LIKE :s)
+      AND (:c IS NULL OR configuration = :c)
+      AND (:m IS NULL OR manufacturer = :m)
+      AND (:v IS NULL OR voltage_rating = :v)"""
+SQL_INSERT_PRODUCT = "INSERT INTO products (product_name, configuration, manufacturer, voltage_rating) VALUES (?, ?, ?, ?)"
+SQL_DELETE_GRAPH_TYPE = "DELETE FROM graph_types WHERE name = ?"
+GRAPH_TYPE_COLUMNS = (
+    'name', 'x_axis', 'y_axis', 'third_col', 'x_min', 'x_max', 'y_min', 'y_max',
+    'x_scale', 'y_scale', 'x_scale_type', 'y_scale_type', 'color_reps', 'output_filename'
+)
+SQL_INSERT_GRAPH_TYPE = "INSERT INTO graph_types ({}) VALUES ({})".format(
+    ", ".join(GRAPH_TYPE_COLUMNS), ", ".join("?" * len(GRAPH_TYPE_COLUMNS)))
+
+def configure_connection(conn):
+    """Apply WAL journaling and the cache pragmas to a connection"""
+    # journal_mode is stored in the file; the others are per connection
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+def connect_database():
+    """Open a configured connection to DB_PATH
+    
+    Connections run in autocommit mode and writes are grouped with
+    transaction(). The statement cache is enlarged so the constant SQL_*
+    statements stay prepared for the lifetime of the connection.
+    """
+    return configure_connection(sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=256))
+
+@contextmanager
+def transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT around the block, rolled back if it raises"""
+    # IMMEDIATE takes the write lock up front, so the block's statements
+    # share one lock acquisition and one journal flush
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        yield conn
+
+def save_many(conn, rows):
+    """Insert curve_data rows (ordered as CURVE_DATA_COLUMNS); run inside transaction()"""
+    conn.executemany(SQL_INSERT_CURVE, rows)
+
+def init_database(conn):
+    # Create/migrate the whole schema with a single commit
+    with transaction(conn):
+        _create_schema(conn.cursor())
+
+def _create_schema(c):
     c.execute('''CREATE TABLE IF NOT EXISTS products (
         product_id INTEGER PRIMARY KEY AUTOINCREMENT,
         product_name TEXT NOT NULL,
@@ -192,176 +319,338 @@ def init_database():
     columns = [col[1] for col in c.fetchall()]
     if 'voltage_rating' not in columns:
         c.execute("ALTER TABLE products ADD COLUMN voltage_rating TEXT")
-    conn.commit()
-    conn.close()
+    # Created after the migrations above, which may add the indexed columns
+    c.execute("CREATE INDEX IF NOT EXISTS idx_curve_data_product ON curve_data(product_id)")
+    # Not UNIQUE: add_product has never rejected duplicate names, so existing
+    # databases may contain them
+    c.execute("CREATE INDEX IF NOT EXISTS idx_products_name ON products(product_name)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_products_filter ON products(configuration, manufacturer, voltage_rating)")
+
+def detect_frame_lines(gray):
+    """Plot frame corners (tl, tr, br, bl) from its outermost axis-aligned lines
+    
+    Lines are found with HoughLinesP on a copy downsampled to HOUGH_SIZE on
+    its long side, then each edge is snapped to the darkest full-resolution
+    row/column within one downsampled pixel. Returns None when no frame-sized
+    pair of horizontal and vertical lines is found.
+    """
+    full = to_host(gray)
+    h, w = full.shape[:2]
+    scale = min(1.0, HOUGH_SIZE / max(h, w))
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    sh, sw = int(round(h * scale)), int(round(w * scale))
+    edges = to_host(cv2.Canny(small, 50, 150))
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, 80, minLineLength=int(0.3 * min(sh, sw)), maxLineGap=20)
+    if lines is None:
+        return None
+    x1, y1, x2, y2 = lines.reshape(-1, 4).T.astype(np.float64)
+    horiz = np.abs(y2 - y1) <= 0.02 * np.abs(x2 - x1)
+    vert = np.abs(x2 - x1) <= 0.02 * np.abs(y2 - y1)
+    if not horiz.any() or not vert.any():
+        return None
+    ys = (y1[horiz] + y2[horiz]) / 2
+    xs = (x1[vert] + x2[vert]) / 2
+    top, bottom, left, right = ys.min(), ys.max(), xs.min(), xs.max()
+    if bottom - top < 0.3 * sh or right - left < 0.3 * sw:
+        return None
+    # Map pixel centers of the downsampled image back to full resolution
+    top, bottom, left, right = ((v + 0.5) / scale - 0.5 for v in (top, bottom, left, right))
+    radius = int(np.ceil(2 / scale)) + 2
+    x0, x1 = int(left), int(right) + 1
+    y0, y1 = int(top), int(bottom) + 1
+
+    def darkest(profile_fn, center, limit):
+        lo = max(int(round(center)) - radius, 0)
+        hi = min(int(round(center)) + radius + 1, limit)
+        # Center of the dark run, so thick frame lines resolve to their middle
+        profile = profile_fn(lo, hi)
+        dark = profile <= profile.min() + 0.25 * (profile.max() - profile.min())
+        return lo + np.flatnonzero(dark).mean()
+
+    top = darkest(lambda a, b: full[a:b, x0:x1].mean(axis=1), top, h)
+    bottom = darkest(lambda a, b: full[a:b, x0:x1].mean(axis=1), bottom, h)
+    left = darkest(lambda a, b: full[y0:y1, a:b].mean(axis=0), left, w)
+    right = darkest(lambda a, b: full[y0:y1, a:b].mean(axis=0), right, w)
+    return np.array([[left, top], [right, top], [right, bottom], [left, bottom]], dtype=np.float32)
+
+def detect_frame_contour(gray):
+    """Plot frame corners (tl, tr, br, bl) from the largest external contour"""
+    edges = to_host(cv2.Canny(gray, 50, 150))
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        logger.error("No contours found in image")
+        return None
+    largest_contour = max(contours, key=cv2.contourArea)
+    epsilon = 0.02 * cv2.arcLength(largest_contour, True)
+    approx = cv2.approxPolyDP(largest_contour, epsilon, True)
+    if len(approx) != 4:
+        logger.error("Failed to detect rectangular grid")
+        return None
+
+    pts = approx.reshape(4, 2)
+    sums = pts.sum(axis=1)
+    diffs = np.diff(pts, axis=1).flatten()
+    rect = np.zeros((4, 2), dtype=np.float32)
+    rect[0] = pts[np.argmin(sums)]
+    rect[2] = pts[np.argmax(sums)]
+    rect[1] = pts[np.argmin(diffs)]
+    rect[3] = pts[np.argmax(diffs)]
+    return rect
+
+def _grid_frequency(projection):
+    """Dominant number of grid cells along a 1D intensity projection, or None"""
+    n = len(projection)
+    # Drop the plot frame at both ends and remove slow trends so only the
+    # thin, repeating grid lines remain
+    margin = n // 50
+    signal = projection[margin:n - margin]
+    signal = signal - uniform_filter1d(signal, 15, mode='nearest')
+    spectrum = np.fft.rfft(signal, 2 * len(signal))
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:len(signal)]
+    if autocorr[0] <= 0:
+        return None
+    # The grid period is the first strong autocorrelation peak; later peaks
+    # at its multiples are as strong, so the first one is taken
+    lo, hi = n // MAX_GRID_SIZE - 1, n // MIN_GRID_SIZE + 1
+    seg = autocorr[lo:hi + 1] / autocorr[0]
+    peaks = np.flatnonzero((seg[1:-1] >= seg[:-2]) & (seg[1:-1] >= seg[2:])) + 1
+    if not len(peaks) or seg[peaks].max() < 0.2:
+        return None
+    lag = lo + peaks[np.argmax(seg[peaks] >= 0.6 * seg[peaks].max())]
+    return int(np.clip(round(n / lag), MIN_GRID_SIZE, MAX_GRID_SIZE))
 
 def auto_detect_grid_size(warped_image):
     logger.debug("Starting grid size detection")
-    gray = cv2.cvtColor(warped_image, cv2.COLOR_BGR2GRAY)
-    f = np.fft.fft2(gray)
-    fshift = np.fft.fftshift(f)
-    magnitude_spectrum = 20 * np.log(np.abs(fshift) + 1)
-    rows, cols = gray.shape
-    crow, ccol = rows // 2, cols // 2
-    spectrum_crop = magnitude_spectrum[crow-100:crow+100, ccol-100:ccol+100]
-    peaks = np.argwhere(spectrum_crop > np.percentile(spectrum_crop, 99.5))
-    if len(peaks) < 4:
+    gray = cv2.cvtColor(warped_image, cv2.COLOR_BGR2GRAY).astype(np.float32)
+    # After the perspective warp the grid lines are axis aligned and span
+    # the whole plot, so the per-column/row median keeps them and drops curves
+    cols = _grid_frequency(np.median(gray, axis=0))
+    rows = _grid_frequency(np.median(gray, axis=1))
+    if rows is None or cols is None:
         logger.warning("Unable to detect grid frequency reliably. Defaulting to 10x10.")
         return 10, 10
-    distances = np.linalg.norm(peaks - np.array([100, 100]), axis=1)
-    dominant_freq = np.median(distances) / 100
-    grid_size = int(1 / dominant_freq)
-    grid_size = np.clip(grid_size, MIN_GRID_SIZE, MAX_GRID_SIZE)
-    logger.debug(f"Detected grid size: {grid_size}x{grid_size}")
-    return grid_size, grid_size
-
-def save_curve_data(file_path, curve_data, representations, x_min, x_max, y_min, y_max, x_scale, y_scale, x_axis_name, y_axis_name, third_column_name, output_filename, output_dir="curve_output"):
+    logger.debug(f"Detected grid size: {rows}x{cols}")
+    return rows, cols
+
+def save_curve_data(file_path, curve_data, representations, x_min, x_max, y_min, y_max, x_scale, y_scale, x_axis_name, y_axis_name, third_column_name, output_filename, output_dir="curve_output", csv_buffer=None):
     logger.debug(f"Saving curve data to {output_dir}/{output_filename}.csv")
     output_dir = os.path.join(SCRIPT_DIR, output_dir)
     os.makedirs(output_dir, exist_ok=True)
     csv_file = os.path.join(output_dir, f"{output_filename}.csv")
     
     sorted_colors = sorted(curve_data.keys())
-    all_rows = []
     headers = [x_axis_name, y_axis_name, third_column_name]
-    all_rows.append(headers)
-    
-    for color in sorted_colors:
-        rep = representations.get(color, color)
-        data = curve_data[color]
-        for x, y in zip(data['x'], data['y']):
-            all_rows.append([x, y, rep])
-    
-    all_rows[1:] = sorted(all_rows[1:], key=lambda row: [row[0], row[2]])
+    reps = [representations.get(color, color) for color in sorted_colors]
+    counts = [len(curve_data[color]['x']) for color in sorted_colors]
+    xs = np.concatenate([np.asarray(curve_data[color]['x'], dtype=float) for color in sorted_colors] or [np.empty(0)])
+    ys = np.concatenate([np.asarray(curve_data[color]['y'], dtype=float) for color in sorted_colors] or [np.empty(0)])
+    color_idx = np.repeat(np.arange(len(sorted_colors)), counts)
+
+    # Sort rows by x, then by representation (stable, like sorted() was)
+    rep_rank = {rep: i for i, rep in enumerate(sorted(set(reps)))}
+    order = np.lexsort((np.array([rep_rank[rep] for rep in reps], dtype=np.int64)[color_idx], xs))
+    # Object array so reps keep their type (int/str) when written
+    row_reps = np.fromiter(reps, dtype=object, count=len(reps))[color_idx[order]]
     
-    with open(csv_file, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerows(all_rows)
+    text = StringIO(newline='')
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    writer.writerows(zip(xs[order].tolist(), ys[order].tolist(), row_reps.tolist()))
+    # Encode once so the file and the caller's buffer get identical bytes
+    data = text.getvalue().encode(locale.getpreferredencoding(False))
+    with open(csv_file, 'wb') as csvfile:
+        csvfile.write(data)
+    if csv_buffer is not None:
+        csv_buffer.write(data)
     
     logger.info(f"Curve data saved to: {csv_file}")
     return csv_file
 
-def process_image(file_path, graph_type, x_axis_name, y_axis_name, third_column_name, x_min, x_max, y_min, y_max, x_scale, y_scale, output_dir, output_filename, representations, x_scale_type, y_scale_type, min_size):
+def render_thumbnail(pdf_data, convert_from_bytes):
+    """100x100 PIL image of the first page of a PDF, or None"""
+    # Let poppler rasterize straight at thumbnail size instead of decoding
+    # the page at full resolution and resizing it afterwards
+    images = convert_from_bytes(pdf_data, first_page=1, last_page=1, size=(100, 100))
+    if not images:
+        return None
+    for extra in images[1:]:
+        extra.close()
+    return images[0]
+
+def _color_pixels(color_labels, color_id, min_size):
+    """(ys, xs) of one color's pixels in components of at least min_size"""
+    warped_mask = cv2.compare(color_labels & (1 << color_id), 0, cv2.CMP_NE)
+    kernel = np.ones((3, 3), np.uint8)
+    cleaned_mask = cv2.morphologyEx(warped_mask, cv2.MORPH_OPEN, kernel)
+    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(cleaned_mask)
+    # Keep the pixels of components at least min_size large with one
+    # per-label lookup instead of scanning the label image per component
+    keep = stats[:, cv2.CC_STAT_AREA] >= min_size
+    keep[0] = False
+    ys, xs = np.nonzero(cleaned_mask)
+    sel = keep[labels[ys, xs]]
+    return ys[sel], xs[sel]
+
+@lru_cache(maxsize=8)
+def _sg_kernels(window, polyorder):
+    """Savitzky-Golay interior kernel plus the edge-fit projections for one window"""
+    # The edges match savgol_filter's default 'interp' mode: a polyfit over
+    # the first/last window samples, which is a fixed linear map of them
+    vander = np.vander(np.arange(window, dtype=float), polyorder + 1)
+    proj = vander @ np.linalg.pinv(vander)
+    half = window // 2
+    return savgol_coeffs(window, polyorder), proj[:half], proj[-half:]
+
+def smooth_curve(y, window, polyorder=SMOOTH_POLYORDER):
+    """savgol_filter(y, window, polyorder) with the filter kernels cached"""
+    coeffs, head, tail = _sg_kernels(window, polyorder)
+    half = window // 2
+    out = convolve1d(y, coeffs, mode='constant')
+    out[:half] = head @ y[:window]
+    out[-half:] = tail @ y[-window:]
+    return out
+
+@njit(cache=True, fastmath=True)
+def _bin_reduce(bins_s, y_s, bin_size, mad_k=2.0, std_thresh=0.3):
+    """Robust per-bin mean over points sorted by bin index
+
+    Each bin drops points further than mad_k MADs from its median and is
+    skipped entirely if the remaining spread exceeds std_thresh.
+    """
+    n_pts = len(bins_s)
+    out_x = np.empty(n_pts)
+    out_y = np.empty(n_pts)
+    n = 0
+    start = 0
+    while start < n_pts:
+        end = start + 1
+        while end < n_pts and bins_s[end] == bins_s[start]:
+            end += 1
+        y_vals = y_s[start:end]
+        median = np.median(y_vals)
+        dev = np.abs(y_vals - median)
+        mad = np.median(dev) + 1e-6
+        filtered = y_vals[dev < mad_k * mad]
+        if len(filtered) > 0 and np.std(filtered) <= std_thresh:
+            out_x[n] = bins_s[start] * bin_size
+            out_y[n] = np.mean(filtered)
+            n += 1
+        start = end
+    return out_x[:n], out_y[:n]
+
+@njit(parallel=True, cache=True)
+def _pix_to_logical(xs, ys, warped_size, x_log, x_off, x_range, y_log, y_off, y_range):
+    """Map warped pixel coordinates to logical axis values in one pass
+
+    For a linear axis off/range are min and max - min; for a log axis they
+    are log10(min) and log10(max) - log10(min).
+    """
+    n = xs.size
+    lx = np.empty(n)
+    ly = np.empty(n)
+    for i in prange(n):
+        if x_log:
+            lx[i] = 10 ** (x_off + (xs[i] / warped_size) * x_range)
+        else:
+            lx[i] = xs[i] * x_range / warped_size + x_off
+        if y_log:
+            ly[i] = 10 ** (y_off + ((warped_size - ys[i]) / warped_size) * y_range)
+        else:
+            ly[i] = (warped_size - ys[i]) * y_range / warped_size + y_off
+    return lx, ly
+
+def process_image(file_path, graph_type, x_axis_name, y_axis_name, third_column_name, x_min, x_max, y_min, y_max, x_scale, y_scale, output_dir, output_filename, representations, x_scale_type, y_scale_type, min_size, image=None, csv_buffer=None):
     logger.debug(f"Processing image: {file_path}")
-    image = cv2.imread(file_path)
+    if image is None:
+        image = cv2.imread(file_path)
     if image is None:
         logger.error(f"Could not load image: {file_path}")
         return None, None
 
-    hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 50, 150)
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not contours:
-        logger.error("No contours found in image")
-        return None, None
-    largest_contour = max(contours, key=cv2.contourArea)
-    epsilon = 0.02 * cv2.arcLength(largest_contour, True)
-    approx = cv2.approxPolyDP(largest_contour, epsilon, True)
-    if len(approx) != 4:
-        logger.error("Failed to detect rectangular grid")
-        return None, None
-
-    pts = approx.reshape(4, 2)
-    sums = pts.sum(axis=1)
-    diffs = np.diff(pts, axis=1).flatten()
-    rect = np.zeros((4, 2), dtype=np.float32)
-    rect[0] = pts[np.argmin(sums)]
-    rect[2] = pts[np.argmax(sums)]
-    rect[1] = pts[np.argmin(diffs)]
-    rect[3] = pts[np.argmax(diffs)]
+    src = to_device(image)
+    gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
+    rect = detect_frame_lines(gray)
+    if rect is None:
+        logger.debug("No plot frame found from Hough lines, falling back to contours")
+        rect = detect_frame_contour(gray)
+        if rect is None:
+            return None, None
 
     warped_size = 1000
     dst = np.array([[0, 0], [warped_size, 0], [warped_size, warped_size], [0, warped_size]], dtype=np.float32)
     M = cv2.getPerspectiveTransform(rect, dst)
-    warped = cv2.warpPerspective(image, M, (warped_size, warped_size))
+    warped_dev = cv2.warpPerspective(src, M, (warped_size, warped_size))
+    warped = to_host(warped_dev)
+    # Color masks are taken on the warped image so only one warp is needed
+    color_labels = classify_colors(to_host(cv2.cvtColor(warped_dev, cv2.COLOR_BGR2HSV)))
 
     rows, cols = auto_detect_grid_size(warped)
     logger.info(f"Estimated grid size: {rows}x{cols}")
 
     curve_data = {}
+    # Per base color: a list of (x array, y array) chunks, one per color
+    # range, concatenated once after the color loop
     base_color_points = defaultdict(list)
     detected_base_colors = set()
 
-    for color_name, (lower, upper) in color_ranges.items():
-        lower = np.array(lower)
-        upper = np.array(upper)
-        mask = cv2.inRange(hsv_image, lower, upper)
-        warped_mask = cv2.warpPerspective(mask, M, (warped_size, warped_size))
-
-        smooth_win = 21 if color_name in ['red', 'red2'] else 17 if color_name == 'blue' else 13
-        kernel = np.ones((3, 3), np.uint8)
-        cleaned_mask = cv2.morphologyEx(warped_mask, cv2.MORPH_OPEN, kernel)
-        num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(cleaned_mask)
-        filtered_mask = np.zeros_like(warped_mask)
-        for i in range(1, num_labels):
-            if stats[i, cv2.CC_STAT_AREA] >= min_size:
-                filtered_mask[labels == i] = 255
-
-        ys, xs = np.where(filtered_mask > 0)
+    # Pixel -> logical mapping constants, hoisted out of the color loop (the
+    # kernel keeps the operation order so bin boundaries do not shift)
+    x_log = x_scale_type != 'linear'
+    if x_log:
+        x_off = np.log10(x_min)
+        x_range = np.log10(x_max) - x_off
+    else:
+        x_off, x_range = float(x_min), float(x_max - x_min)
+    y_log = y_scale_type != 'linear'
+    if y_log:
+        y_off = np.log10(y_min)
+        y_range = np.log10(y_max) - y_off
+    else:
+        y_off, y_range = float(y_min), float(y_max - y_min)
+
+    # The mask stages release the GIL inside OpenCV, so colors run
+    # concurrently; map() keeps color order so concatenation is unchanged.
+    # The numba mapping below stays on this thread.
+    with ThreadPoolExecutor(max_workers=MAX_COLOR_WORKERS) as pool:
+        color_pixels = list(pool.map(lambda cid: _color_pixels(color_labels, cid, min_size), range(len(color_ranges))))
+
+    for color_name, (ys, xs) in zip(color_ranges, color_pixels):
         if len(xs) == 0:
             logger.debug(f"No points detected for color {color_name}")
             continue
         logger.debug(f"Detected {len(xs)} points for color {color_name}")
 
-        if x_scale_type == 'linear':
-            logical_x = xs * (x_max - x_min) / warped_size + x_min
-        else:
-            f = xs / warped_size
-            log_x = np.log10(x_min) + f * (np.log10(x_max) - np.log10(x_min))
-            logical_x = 10 ** log_x
-
-        if y_scale_type == 'linear':
-            logical_y = (warped_size - ys) * (y_max - y_min) / warped_size + y_min
-        else:
-            f = (warped_size - ys) / warped_size
-            log_y = np.log10(y_min) + f * (np.log10(y_max) - np.log10(y_min))
-            logical_y = 10 ** log_y
+        logical_x, logical_y = _pix_to_logical(xs, ys, warped_size, x_log, x_off, x_range, y_log, y_off, y_range)
 
         base_color = color_to_base.get(color_name, color_name)
-        base_color_points[base_color].extend(zip(logical_x, logical_y))
+        base_color_points[base_color].append((logical_x, logical_y))
         detected_base_colors.add(base_color)
 
-    for base_color, points in base_color_points.items():
-        if not points:
+    for base_color, parts in base_color_points.items():
+        logical_x = np.concatenate([p[0] for p in parts])
+        logical_y = np.concatenate([p[1] for p in parts])
+        if not len(logical_x):
             continue
-        logger.debug(f"Processing {len(points)} points for base color {base_color}")
-
-        all_x, all_y = zip(*points)
-        logical_x = list(all_x)
-        logical_y = list(all_y)
-
-        data = defaultdict(list)
-        for lx, ly in zip(logical_x, logical_y):
-            bin_x = round(lx / BIN_SIZE) * BIN_SIZE
-            data[bin_x].append(ly)
+        logger.debug(f"Processing {len(logical_x)} points for base color {base_color}")
 
-        final_x, final_y = [], []
-        for x_val, y_vals in sorted(data.items()):
-            y_vals = np.array(y_vals)
-            if len(y_vals) == 0:
-                continue
-            median = np.median(y_vals)
-            mad = np.median(np.abs(y_vals - median)) + 1e-6
-            filtered = y_vals[np.abs(y_vals - median) < 2 * mad]
-            if np.std(filtered) > 0.3:
-                continue
-            if len(filtered) > 0:
-                final_x.append(x_val)
-                final_y.append(np.mean(filtered))
+        # Group by bin with one stable sort (keeping each bin's points in
+        # detection order) instead of a dict of per-bin Python lists
+        bins = np.rint(logical_x / BIN_SIZE).astype(np.int64)
+        order = np.argsort(bins, kind='stable')
+        final_x, final_y = _bin_reduce(bins[order], logical_y[order], BIN_SIZE)
 
         smooth_win = 21 if base_color == 'red' else 17 if base_color == 'blue' else 13
         if len(final_y) > smooth_win:
-            smooth_y = savgol_filter(final_y, smooth_win, SMOOTH_POLYORDER)
+            smooth_y = smooth_curve(final_y, smooth_win)
         else:
             smooth_y = final_y
 
         curve_data[base_color] = {
-            'x': [x * x_scale for x in final_x],
-            'y': [y * y_scale for y in (smooth_y.tolist() if hasattr(smooth_y, 'tolist') else smooth_y)]
+            'x': final_x * x_scale,
+            'y': np.asarray(smooth_y) * y_scale
         }
 
-    csv_file = save_curve_data(file_path, curve_data, representations, x_min * x_scale, x_max * x_scale, y_min * y_scale, y_max * y_scale, 1, 1, x_axis_name, y_axis_name, third_column_name, output_filename, output_dir)
+    csv_file = save_curve_data(file_path, curve_data, representations, x_min * x_scale, x_max * x_scale, y_min * y_scale, y_max * y_scale, 1, 1, x_axis_name, y_axis_name, third_column_name, output_filename, output_dir, csv_buffer)
     return curve_data, csv_file
 
 class CurveExtractionApp:
@@ -380,8 +669,8 @@ class CurveExtractionApp:
         style.configure('TRadiobutton', font=('Helvetica', 10))
         style.configure('TCombobox', padding=3)
 
-        init_database()
-        self.conn = sqlite3.connect(DB_PATH)
+        self.conn = connect_database()
+        init_database(self.conn)
         self.cursor = self.conn.cursor()
 
         # ─────────── top tool bar ───────────
@@ -429,6 +718,7 @@ class CurveExtractionApp:
         ttk.Label(left_panel, text="Extracted Graph").pack()
         self.fig = Figure(figsize=(5, 3.5), dpi=100)
         self.ax = self.fig.add_subplot(111)
+        self._lines = {}  # base color -> Line2D, reused across plot_curves calls
         self.graph_canvas = FigureCanvasTkAgg(self.fig, master=left_panel)
         self.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=5)
 
@@ -538,6 +828,24 @@ class CurveExtractionApp:
         self.output_filename_entry = ttk.Entry(out_grp)
         self.output_filename_entry.pack(fill=tk.X)
 
+        # Entry widget <- GRAPH_PRESETS key, applied by update_graph_type
+        self._preset_bindings = [
+            (self.x_axis_entry, 'x_axis'), (self.y_axis_entry, 'y_axis'),
+            (self.third_col_entry, 'third_col'),
+            (self.x_min_entry, 'x_min'), (self.x_max_entry, 'x_max'),
+            (self.y_min_entry, 'y_min'), (self.y_max_entry, 'y_max'),
+            (self.x_scale_entry, 'x_scale'), (self.y_scale_entry, 'y_scale'),
+            (self.output_filename_entry, 'output_filename'),
+        ]
+        # Numeric settings: (key, Entry, default when empty), see _read_floats
+        self._float_fields = [
+            ('x_min', self.x_min_entry, 0), ('x_max', self.x_max_entry, 10),
+            ('y_min', self.y_min_entry, 0), ('y_max', self.y_max_entry, 100),
+            ('x_scale', self.x_scale_entry, 1.0), ('y_scale', self.y_scale_entry, 1.0),
+        ]
+        self._float_sig = None
+        self._float_vals = None
+
         #    F. Add-product (moved from DB tab) ---------------------------------------
         prod_grp = ttk.LabelFrame(self.left_input, text="Add Product")
         prod_grp.pack(fill=tk.X, padx=5, pady=5)
@@ -577,6 +885,9 @@ class CurveExtractionApp:
         self.color_canvas.create_window((0, 0), window=self.color_reps_frame, anchor='nw')
         self.color_reps_frame.bind("<Configure>", lambda e: self.color_canvas.configure(scrollregion=self.color_canvas.bbox("all")))
         self.color_rep_entries = {}
+        self._image_cache = OrderedDict()
+        self._detected_colors_key = None
+        self._detected_colors = set()
 
         # ══════════════════════════════════════════════════════════════════════════════
         #                               DATABASE TAB
@@ -612,6 +923,7 @@ class CurveExtractionApp:
 
         for cb in (self.config_combo, self.manuf_combo, self.voltage_rating_combo, self.product_combo):
             cb.bind("<<ComboboxSelected>>", lambda e: self.search_products())
+        self._search_after_id = None
         self.search_var.trace_add('write', self.search_products)
 
         # results area
@@ -624,11 +936,19 @@ class CurveExtractionApp:
         self.db_graph_canvas.create_window((0, 0), window=self.db_graph_frame, anchor='nw')
         self.db_graph_frame.bind("<Configure>", lambda e: self.db_graph_canvas.configure(scrollregion=self.db_graph_canvas.bbox("all")))
         self.thumbnail_photos = []
+        self._thumb_cache = OrderedDict()
+        self._graph_label_pool = []
+        self._last_displayed_product = None
+        self._db_dirty = True
+        self._thumb_exec = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self._thumb_futures = []
+        self._thumb_generation = 0
 
         # ─────────── misc init ───────────
         self.min_size = tk.IntVar(value=1000)
         self.photo = None
         self.representations = {}
+        self._last_csv_bytes = None
         self.update_graph_type()
         self.update_product_combo()
         logger.debug("GUI initialised with two PanedWindows.")
@@ -646,18 +966,11 @@ class CurveExtractionApp:
         self.color_rep_entries.clear()
         if self.graph_type_var.get() == "custom" and hasattr(self, 'file_path'):
             ttk.Label(self.color_reps_frame, text="Color Representations", font=('Helvetica', 10, 'bold')).pack(anchor="w", pady=5)
-            temp_image = cv2.imread(self.file_path)
-            if temp_image is None:
+            detected_base_colors = self.detect_base_colors()
+            if detected_base_colors is None:
                 logger.error("Failed to read image for color detection")
                 self.status_label.config(text="Failed to read image for color detection")
                 return
-            hsv_image = cv2.cvtColor(temp_image, cv2.COLOR_BGR2HSV)
-            detected_base_colors = set()
-            for color_name, (lower, upper) in color_ranges.items():
-                mask = cv2.inRange(hsv_image, np.array(lower), np.array(upper))
-                if np.any(mask):
-                    base_color = color_to_base.get(color_name, color_name)
-                    detected_base_colors.add(base_color)
             for color in sorted(detected_base_colors):
                 frame = ttk.Frame(self.color_reps_frame)
                 frame.pack(fill=tk.X, pady=2)
@@ -669,44 +982,66 @@ class CurveExtractionApp:
                     entry.insert(0, self.representations[color])
             logger.debug(f"Updated color representations for {detected_base_colors}")
 
+    def _load_image(self, path):
+        """(key, BGR image, HSV image) for path, cached for the last few files"""
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            return None
+        if key in self._image_cache:
+            self._image_cache.move_to_end(key)
+            return (key,) + self._image_cache[key]
+        image = cv2.imread(path)
+        if image is None:
+            return None
+        self._image_cache[key] = (image, cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+        while len(self._image_cache) > IMAGE_CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+        return (key,) + self._image_cache[key]
+
+    def detect_base_colors(self):
+        """Base colors present in the loaded image, cached per file"""
+        loaded = self._load_image(self.file_path)
+        if loaded is None:
+            return None
+        key, _, hsv_image = loaded
+        if key == self._detected_colors_key:
+            return self._detected_colors
+        # One classification pass at full size: thin curves blend into the
+        # background when downsampled and would drop below the S threshold
+        present = int(np.bitwise_or.reduce(classify_colors(hsv_image), axis=None))
+        self._detected_colors = {color_to_base.get(color_name, color_name)
+                                 for color_id, color_name in enumerate(color_ranges)
+                                 if present & (1 << color_id)}
+        self._detected_colors_key = key
+        return self._detected_colors
+
     def update_graph_type(self, *args):
         """
         Update the UI fields and color representations based on the selected graph type.
         """
         graph_type = self.graph_type_var.get()
         preset = GRAPH_PRESETS.get(graph_type, GRAPH_PRESETS['custom'])
-        self.x_axis_entry.delete(0, tk.END)
-        self.x_axis_entry.insert(0, preset['x_axis'])
-        self.y_axis_entry.delete(0, tk.END)
-        self.y_axis_entry.insert(0, preset['y_axis'])
-        self.third_col_entry.delete(0, tk.END)
-        self.third_col_entry.insert(0, preset['third_col'])
-        self.x_min_entry.delete(0, tk.END)
-        self.x_min_entry.insert(0, preset['x_min'])
-        self.x_max_entry.delete(0, tk.END)
-        self.x_max_entry.insert(0, preset['x_max'])
-        self.y_min_entry.delete(0, tk.END)
-        self.y_min_entry.insert(0, preset['y_min'])
-        self.y_max_entry.delete(0, tk.END)
-        self.y_max_entry.insert(0, preset['y_max'])
-        self.x_scale_entry.delete(0, tk.END)
-        self.x_scale_entry.insert(0, preset['x_scale'])
-        self.y_scale_entry.delete(0, tk.END)
-        self.y_scale_entry.insert(0, preset['y_scale'])
-        self.x_scale_type.set(preset.get('x_scale_type', 'linear'))
-        self.y_scale_type.set(preset.get('y_scale_type', 'linear'))
-        self.output_dir_entry.delete(0, tk.END)
-        self.output_dir_entry.insert(0, "curve_output")
-        self.output_filename_entry.delete(0, tk.END)
-        self.output_filename_entry.insert(0, preset['output_filename'])
+        # Only touch widgets whose value actually changes
+        entries = [(widget, preset[key]) for widget, key in self._preset_bindings]
+        entries.append((self.output_dir_entry, "curve_output"))
+        for widget, value in entries:
+            value = str(value)
+            if widget.get() != value:
+                widget.delete(0, tk.END)
+                widget.insert(0, value)
+        for var, key in ((self.x_scale_type, 'x_scale_type'), (self.y_scale_type, 'y_scale_type')):
+            value = preset.get(key, 'linear')
+            if var.get() != value:
+                var.set(value)
         self.representations = preset.get('color_reps', {})
         self.update_color_reps_frame()
     def update_graph_type_list(self):
     # Start with the preset types
         self.graph_types = list(GRAPH_PRESETS.keys())
         # Add custom types from the database
-        self.cursor.execute("SELECT name FROM graph_types")
-        custom_types = [row[0] for row in self.cursor.fetchall() if row[0] not in self.graph_types]
+        self.cursor.execute(SQL_SELECT_CUSTOM_GRAPH_TYPES, self.graph_types)
+        custom_types = [name for (name,) in self.cursor]
         self.graph_types += custom_types
         self.graph_type_combo['values'] = self.graph_types
     def save_graph_type(self):
@@ -728,29 +1063,21 @@ class CurveExtractionApp:
                 'x_axis': self.x_axis_entry.get() or "X",
                 'y_axis': self.y_axis_entry.get() or "Y",
                 'third_col': self.third_col_entry.get() or "Label",
-                'x_min': float(self.x_min_entry.get() or 0),
-                'x_max': float(self.x_max_entry.get() or 10),
-                'y_min': float(self.y_min_entry.get() or 0),
-                'y_max': float(self.y_max_entry.get() or 100),
-                'x_scale': float(self.x_scale_entry.get() or 1.0),
-                'y_scale': float(self.y_scale_entry.get() or 1.0),
+                **self._read_floats(),
                 'x_scale_type': self.x_scale_type.get(),
                 'y_scale_type': self.y_scale_type.get(),
                 'color_reps': color_reps,
                 'output_filename': self.output_filename_entry.get() or "output"
             }
-            self.cursor.execute('''INSERT INTO graph_types (
-                name, x_axis, y_axis, third_col, x_min, x_max, y_min, y_max,
-                x_scale, y_scale, x_scale_type, y_scale_type, color_reps, output_filename
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (
-                name, settings['x_axis'], settings['y_axis'], settings['third_col'],
-                settings['x_min'], settings['x_max'], settings['y_min'], settings['y_max'],
-                settings['x_scale'], settings['y_scale'], settings['x_scale_type'],
-                settings['y_scale_type'], json.dumps(settings['color_reps']),
-                settings['output_filename']
-            ))
-            self.conn.commit()
+            with transaction(self.conn):
+                self.cursor.execute(SQL_INSERT_GRAPH_TYPE,
+                (
+                    name, settings['x_axis'], settings['y_axis'], settings['third_col'],
+                    settings['x_min'], settings['x_max'], settings['y_min'], settings['y_max'],
+                    settings['x_scale'], settings['y_scale'], settings['x_scale_type'],
+                    settings['y_scale_type'], json.dumps(settings['color_reps']),
+                    settings['output_filename']
+                ))
             self.update_graph_type_list()
             self.graph_type_var.set(name)
             self.update_graph_type()
@@ -770,8 +1097,9 @@ class CurveExtractionApp:
             return
 
         try:
-            self.cursor.execute("DELETE FROM graph_types WHERE name = ?", (selected,))
-            self.conn.commit()
+            with transaction(self.conn):
+                self.cursor.execute(SQL_DELETE_GRAPH_TYPE, (selected,))
+            self._db_dirty = True
             self.update_graph_type_list()
             self.graph_type_var.set("custom")
             self.update_graph_type()
@@ -782,8 +1110,8 @@ class CurveExtractionApp:
             logger.error(f"Failed to delete graph type: {str(e)}")
 
     def update_product_combo(self):
-        self.cursor.execute("SELECT DISTINCT product_name FROM products")
-        products = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute(SQL_SELECT_PRODUCT_NAMES)
+        products = [name for (name,) in self.cursor]
         self.product_combo['values'] = products
         if products:
             self.product_var.set(products[0])
@@ -792,26 +1120,24 @@ class CurveExtractionApp:
         self.search_products()
 
     def search_products(self, *args):
+        # Debounce: typing reschedules the query, which runs once input settles
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._do_search)
+
+    def _do_search(self):
+        self._search_after_id = None
         search_text = self.search_var.get().lower()
         config = self.config_var.get()
         manuf = self.manuf_var.get()
         voltage_rating = self.voltage_rating_var.get()
-        query = "SELECT DISTINCT product_name FROM products WHERE 1=1"
-        params = []
-        if search_text:
-            query += " AND product_name LIKE ?"
-            params.append(f"%{search_text}%")
-        if config:
-            query += " AND configuration = ?"
-            params.append(config)
-        if manuf:
-            query += " AND manufacturer = ?"
-            params.append(manuf)
-        if voltage_rating:
-            query += " AND voltage_rating = ?"
-            params.append(voltage_rating)
-        self.cursor.execute(query, params)
-        products = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute(SQL_SEARCH_PRODUCTS, {
+            's': f"%{search_text}%" if search_text else None,
+            'c': config or None,
+            'm': manuf or None,
+            'v': voltage_rating or None,
+        })
+        products = [name for (name,) in self.cursor]
         self.product_combo['values'] = products
         if products:
             self.product_var.set(products[0])
@@ -828,9 +1154,10 @@ class CurveExtractionApp:
             messagebox.showwarning("Warning", "Please enter a product name!")
             return
         try:
-            self.cursor.execute("INSERT INTO products (product_name, configuration, manufacturer, voltage_rating) VALUES (?, ?, ?, ?)",
-                               (product_name, configuration or None, manufacturer or None, voltage_rating or None))
-            self.conn.commit()
+            with transaction(self.conn):
+                self.cursor.execute(SQL_INSERT_PRODUCT,
+                                   (product_name, configuration or None, manufacturer or None, voltage_rating or None))
+            self._db_dirty = True
             self.update_product_combo()
             self.new_product_entry.delete(0, tk.END)
             self.new_config_entry.set("")
@@ -843,46 +1170,93 @@ class CurveExtractionApp:
             logger.error(f"Failed to add product: {str(e)}")
 
     def display_product_graphs(self):
-        from io import BytesIO
         try:
             from pdf2image import convert_from_bytes
         except ImportError:
             logger.error("pdf2image not installed. Install with 'pip install pdf2image' and ensure Poppler is installed.")
             self.status_label.config(text="pdf2image not installed")
             return
-        for widget in self.db_graph_frame.winfo_children():
-            widget.destroy()
-        self.thumbnail_photos.clear()
         product = self.product_var.get()
+        # Nothing to redo when the same product is shown and no write happened
+        if product == self._last_displayed_product and not self._db_dirty:
+            return
+        self._last_displayed_product = product
+        self._db_dirty = False
+        # Labels are pooled across listings; hide them all and reuse below
+        for label in self._graph_label_pool:
+            label.grid_remove()
+        self.thumbnail_photos.clear()
+        # Drop renders still queued for the previous listing; ones already
+        # running are ignored when they finish via the generation check
+        self._thumb_generation += 1
+        for fut in self._thumb_futures:
+            fut.cancel()
+        self._thumb_futures.clear()
         if not product:
             return
-        self.cursor.execute("SELECT product_id FROM products WHERE product_name = ?", (product,))
+        self.cursor.execute(SQL_SELECT_PRODUCT_ID, (product,))
         product_id = self.cursor.fetchone()
         if not product_id:
             return
         product_id = product_id[0]
-        self.cursor.execute("SELECT id, pdf_file, timestamp FROM curve_data WHERE product_id = ?", (product_id,))
+        # List metadata only; PDF BLOBs are fetched per graph on a cache miss
+        self.cursor.execute(SQL_SELECT_CURVES, (product_id,))
         graphs = self.cursor.fetchall()
-        row = 0
-        for graph_id, pdf_data, timestamp in graphs:
-            try:
-                images = convert_from_bytes(pdf_data)
-                if images:
-                    img = images[0].resize((100, 100), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    self.thumbnail_photos.append(photo)
-                    label = ttk.Label(self.db_graph_frame, image=photo, text=f"ID {graph_id}: {timestamp}", compound="top")
-                    label.grid(row=row, column=0, padx=5, pady=5)
-                    row += 1
-            except Exception as e:
-                logger.error(f"Failed to display thumbnail for graph ID {graph_id}: {str(e)}")
-        logger.debug(f"Displayed {row} graph thumbnails for product '{product}'")
+        while len(self._graph_label_pool) < len(graphs):
+            self._graph_label_pool.append(ttk.Label(self.db_graph_frame, compound="top"))
+        shown = []
+        for label, (graph_id, timestamp) in zip(self._graph_label_pool, graphs):
+            label.configure(text=f"ID {graph_id}: {timestamp}", image='')
+            if graph_id in self._thumb_cache:
+                self._thumb_cache.move_to_end(graph_id)
+                self.thumbnail_photos.append(self._thumb_cache[graph_id])
+                label.configure(image=self._thumb_cache[graph_id])
+                shown.append(label)
+                continue
+            pdf_data = self.conn.execute(SQL_SELECT_PDF, (graph_id,)).fetchone()
+            if not pdf_data or not pdf_data[0]:
+                continue
+            shown.append(label)
+            # Rasterize off the Tk thread; the PhotoImage is built back on it
+            fut = self._thumb_exec.submit(render_thumbnail, pdf_data[0], convert_from_bytes)
+            del pdf_data
+            fut.add_done_callback(lambda f, gen=self._thumb_generation, gid=graph_id, lbl=label:
+                                  self.root.after(0, self._install_thumbnail, gen, gid, lbl, f))
+            self._thumb_futures.append(fut)
+        # Place all labels in one pass once they are configured
+        for row, label in enumerate(shown):
+            label.grid(row=row, column=0, padx=5, pady=5)
+        logger.debug(f"Listed {len(graphs)} graphs for product '{product}'")
+
+    def _install_thumbnail(self, generation, graph_id, label, fut):
+        """Show a finished render on its label and add it to the LRU cache"""
+        if fut.cancelled() or generation != self._thumb_generation:
+            return
+        try:
+            img = fut.result()
+        except Exception as e:
+            logger.error(f"Failed to display thumbnail for graph ID {graph_id}: {str(e)}")
+            img = None
+        if img is None:
+            label.grid_remove()
+            return
+        photo = ImageTk.PhotoImage(img)
+        img.close()
+        # curve_data rows are never updated in place, so the id identifies the render
+        self._thumb_cache[graph_id] = photo
+        while len(self._thumb_cache) > THUMB_CACHE_SIZE:
+            self._thumb_cache.popitem(last=False)
+        self.thumbnail_photos.append(photo)
+        label.configure(image=photo)
 
     def load_image(self):
         file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp")])
         if file_path:
             try:
-                self.image = Image.open(file_path)
+                # Keep the file bytes; save_to_database stores them as-is
+                with open(file_path, 'rb') as f:
+                    png_data = f.read()
+                self.image = Image.open(BytesIO(png_data))
                 self.image = self.image.resize((self.canvas_w, self.canvas_h), Image.Resampling.LANCZOS)
                 self.photo = ImageTk.PhotoImage(self.image)
                 self.input_canvas.delete("all")
@@ -893,10 +1267,10 @@ class CurveExtractionApp:
                 x = (canvas_width - img_width) // 2
                 y = (canvas_height - img_height) // 2
                 self.input_canvas.create_image(x, y, anchor="nw", image=self.photo)
-                self.ax.clear()
-                self.graph_canvas.draw()
+                self._clear_plot()
                 self.status_label.config(text=f"Image loaded: {os.path.basename(file_path)}")
                 self.file_path = file_path
+                self.png_data = png_data
                 self.curve_data = None
                 self.update_color_reps_frame()
                 logger.debug(f"Image loaded: {file_path}")
@@ -926,12 +1300,9 @@ class CurveExtractionApp:
             x_axis_name = self.x_axis_entry.get() or "X"
             y_axis_name = self.y_axis_entry.get() or "Y"
             third_col_name = self.third_col_entry.get() or "Label"
-            x_min = float(self.x_min_entry.get() or 0)
-            x_max = float(self.x_max_entry.get() or 10)
-            y_min = float(self.y_min_entry.get() or 0)
-            y_max = float(self.y_max_entry.get() or 100)
-            x_scale = float(self.x_scale_entry.get() or 1.0)
-            y_scale = float(self.y_scale_entry.get() or 1.0)
+            nums = self._read_floats()
+            x_min, x_max, y_min, y_max = nums['x_min'], nums['x_max'], nums['y_min'], nums['y_max']
+            x_scale, y_scale = nums['x_scale'], nums['y_scale']
             output_dir = self.output_dir_entry.get() or "curve_output"
             output_filename = self.output_filename_entry.get() or "output"
             x_scale_type = self.x_scale_type.get()
@@ -950,11 +1321,16 @@ class CurveExtractionApp:
             else:
                 self.representations = GRAPH_PRESETS[graph_type]['color_reps'] if graph_type in GRAPH_PRESETS else self.representations
 
+            loaded = self._load_image(self.file_path)
+            csv_buffer = BytesIO()
             self.curve_data, csv_file = process_image(
                 self.file_path, graph_type, x_axis_name, y_axis_name, third_col_name,
                 x_min, x_max, y_min, y_max, x_scale, y_scale, output_dir, output_filename,
-                self.representations, x_scale_type, y_scale_type, min_size
+                self.representations, x_scale_type, y_scale_type, min_size,
+                image=loaded[1] if loaded else None, csv_buffer=csv_buffer
             )
+            # Kept for save_to_database, which would otherwise re-read the file
+            self._last_csv_bytes = csv_buffer.getvalue() if self.curve_data else None
 
             if self.curve_data:
                 self.plot_curves(x_min * x_scale, x_max * x_scale, y_min * y_scale, y_max * y_scale, x_axis_name, y_axis_name, x_scale_type, y_scale_type)
@@ -970,6 +1346,15 @@ class CurveExtractionApp:
             messagebox.showerror("Error", f"Processing failed: {str(e)}")
             logger.error(f"Processing failed: {str(e)}")
 
+    def _read_floats(self):
+        """Parse the numeric axis/scale entries, reusing the last result if unchanged"""
+        sig = tuple(widget.get() for _, widget, _ in self._float_fields)
+        if sig != self._float_sig:
+            self._float_vals = {key: float(text or default)
+                                for (key, _, default), text in zip(self._float_fields, sig)}
+            self._float_sig = sig
+        return self._float_vals
+
     def save_to_database(self):
         if not hasattr(self, 'file_path') or not self.curve_data:
             messagebox.showwarning("Warning", "Please process an image first!")
@@ -979,37 +1364,21 @@ class CurveExtractionApp:
             return
 
         try:
-            self.cursor.execute("SELECT product_id FROM products WHERE product_name = ?", (self.product_var.get(),))
-            product_id = self.cursor.fetchone()
-            if not product_id:
-                raise ValueError(f"Product '{self.product_var.get()}' not found in database")
-            product_id = product_id[0]
-
-            with open(self.file_path, 'rb') as f:
-                png_data = f.read()
+            png_data = self.png_data
 
-            csv_path = os.path.join(SCRIPT_DIR, self.output_dir_entry.get() or "curve_output", f"{self.output_filename_entry.get() or 'output'}.csv")
-            with open(csv_path, 'rb') as f:
-                csv_data = f.read()
+            csv_data = self._last_csv_bytes
 
-            pdf_path = os.path.join(SCRIPT_DIR, "temp_plot.pdf")
-            with PdfPages(pdf_path) as pdf:
+            buf = BytesIO()
+            with PdfPages(buf) as pdf:
                 pdf.savefig(self.fig)
-            with open(pdf_path, 'rb') as f:
-                pdf_data = f.read()
-            os.remove(pdf_path)
+            pdf_data = buf.getvalue()
 
             settings = {
                 'graph_type': self.graph_type_var.get(),
                 'x_axis_name': self.x_axis_entry.get() or "X",
                 'y_axis_name': self.y_axis_entry.get() or "Y",
                 'third_col_name': self.third_col_entry.get() or "Label",
-                'x_min': float(self.x_min_entry.get() or 0),
-                'x_max': float(self.x_max_entry.get() or 10),
-                'y_min': float(self.y_min_entry.get() or 0),
-                'y_max': float(self.y_max_entry.get() or 100),
-                'x_scale': float(self.x_scale_entry.get() or 1.0),
-                'y_scale': float(self.y_scale_entry.get() or 1.0),
+                **self._read_floats(),
                 'x_scale_type': self.x_scale_type.get(),
                 'y_scale_type': self.y_scale_type.get(),
                 'min_size': self.min_size.get(),
@@ -1018,20 +1387,22 @@ class CurveExtractionApp:
             json_data = json.dumps(settings).encode('utf-8')
 
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute('''INSERT INTO curve_data (
-                product_id, timestamp, png_file, csv_file, pdf_file, json_file,
-                graph_type, x_axis_name, y_axis_name, third_col_name,
-                x_min, x_max, y_min, y_max, x_scale, y_scale,
-                x_scale_type, y_scale_type, min_size
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (
-                product_id, timestamp, sqlite3.Binary(png_data), sqlite3.Binary(csv_data), sqlite3.Binary(pdf_data), sqlite3.Binary(json_data),
-                settings['graph_type'], settings['x_axis_name'], settings['y_axis_name'], settings['third_col_name'],
-                settings['x_min'] * settings['x_scale'], settings['x_max'] * settings['x_scale'],
-                settings['y_min'] * settings['y_scale'], settings['y_max'] * settings['y_scale'],
-                settings['x_scale'], settings['y_scale'], settings['x_scale_type'], settings['y_scale_type'], settings['min_size']
-            ))
-            self.conn.commit()
+            # Files are read above so the write lock only covers the lookup
+            # and the insert
+            with transaction(self.conn):
+                self.cursor.execute(SQL_SELECT_PRODUCT_ID, (self.product_var.get(),))
+                product_id = self.cursor.fetchone()
+                if not product_id:
+                    raise ValueError(f"Product '{self.product_var.get()}' not found in database")
+                product_id = product_id[0]
+                save_many(self.conn, [(
+                    product_id, timestamp, sqlite3.Binary(png_data), sqlite3.Binary(csv_data), sqlite3.Binary(pdf_data), sqlite3.Binary(json_data),
+                    settings['graph_type'], settings['x_axis_name'], settings['y_axis_name'], settings['third_col_name'],
+                    settings['x_min'] * settings['x_scale'], settings['x_max'] * settings['x_scale'],
+                    settings['y_min'] * settings['y_scale'], settings['y_max'] * settings['y_scale'],
+                    settings['x_scale'], settings['y_scale'], settings['x_scale_type'], settings['y_scale_type'], settings['min_size']
+                )])
+            self._db_dirty = True
             self.status_label.config(text=f"Data saved to product '{self.product_var.get()}'")
             logger.debug(f"Data saved to product '{self.product_var.get()}'")
         except Exception as e:
@@ -1039,41 +1410,57 @@ class CurveExtractionApp:
             logger.error(f"Failed to save to database: {str(e)}")
 
     def plot_curves(self, x_min, x_max, y_min, y_max, x_axis_name, y_axis_name, x_scale_type, y_scale_type):
-        self.ax.clear()
-
-        if x_scale_type == 'log':
-            self.ax.set_xscale('log')
-        if y_scale_type == 'log':
-            self.ax.set_yscale('log')
+        self.ax.set_xscale('log' if x_scale_type == 'log' else 'linear')
+        self.ax.set_yscale('log' if y_scale_type == 'log' else 'linear')
 
+        # Update existing lines in place; only new colors create artists
+        for color in set(self._lines) - set(self.curve_data):
+            self._lines.pop(color).remove()
         for color, data in self.curve_data.items():
-            self.ax.plot(data['x'], data['y'], color=display_colors.get(color, 'g'), label=self.representations.get(color, color))
+            label = self.representations.get(color, color)
+            line = self._lines.get(color)
+            if line is None:
+                self._lines[color], = self.ax.plot(data['x'], data['y'], color=display_colors.get(color, 'g'), label=label)
+            else:
+                line.set_data(data['x'], data['y'])
+                line.set_label(label)
 
         self.ax.set_xlim(x_min, x_max)
         self.ax.set_ylim(y_min, y_max)
         self.ax.set_xlabel(x_axis_name)
         self.ax.set_ylabel(y_axis_name)
         self.ax.grid(True, which="both", ls="--", alpha=0.7)
+        legend = self.ax.get_legend()
         if self.representations:
             self.ax.legend()
+        elif legend is not None:
+            legend.remove()
         self.fig.tight_layout()
+        self.graph_canvas.draw_idle()
+
+    def _clear_plot(self):
+        self.ax.clear()
+        self._lines.clear()
         self.graph_canvas.draw()
 
     def clear_all(self):
         self.input_canvas.delete("all")
-        self.ax.clear()
-        self.graph_canvas.draw()
+        self._clear_plot()
         self.photo = None
         self.curve_data = None
+        self._last_csv_bytes = None
         self.representations = {}
         self.graph_type_var.set("custom")
         self.update_graph_type()
         self.status_label.config(text="All cleared")
         if hasattr(self, 'file_path'):
             del self.file_path
+            del self.png_data
         logger.debug("Cleared all data and canvases")
 
     def __del__(self):
+        if hasattr(self, '_thumb_exec'):
+            self._thumb_exec.shutdown(wait=False, cancel_futures=True)
         if hasattr(self, 'conn'):
             self.conn.close()
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script for the column-pruned CSV loader in asm.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Import asm from this directory
+sys.path.insert(0, str(Path(__file__).parent))
+
+import asm
+
+
+def _write_csv(text):
+    f = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+    f.write(text)
+    f.close()
+    return f.name
+
+
+def test_read_csv_selected_columns():
+    """Only the requested columns are loaded"""
+    asm._load_numeric()
+    path = _write_csv("vgs,vds,id,extra\n1,2,3,4\n5,6,7,8\n")
+    data = asm._read_csv(path, ["vgs", "vds", "id"])
+    assert sorted(data.columns) == ["id", "vds", "vgs"]
+    assert data["id"].tolist() == [3, 7]
+
+
+def test_read_csv_missing_column():
+    """A missing column falls back to a full read instead of raising"""
+    asm._load_numeric()
+    path = _write_csv("vgs,vds\n1,2\n5,6\n")
+    data = asm._read_csv(path, ["vgs", "vds", "id"])
+    assert sorted(data.columns) == ["vds", "vgs"]
+
+
+def test_fit_from_file_missing_column(capsys):
+    """The extractor's own column check reports the missing column"""
+    path = _write_csv("vgs,rds\n1,2\n5,6\n")
+    assert asm._fit_from_file("rds_vgs", path) is None
+    assert "must contain 'vgs', 'rds', and 'id'" in capsys.readouterr().out
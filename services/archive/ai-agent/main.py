@@ -1,19 +1,89 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, NamedTuple, Tuple
 import httpx
+import redis.asyncio as redis
 import asyncio
-import json
+import gzip
+import orjson
 import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from functools import lru_cache
 from datetime import datetime
 import uuid
 from enum import Enum
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Agent Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the orchestrator's clients for the lifetime of the server"""
+    logger.info("AI Agent Service starting up...")
+    app.state.http_client = await orchestrator.start()
+    
+    # Health check all services
+    health_status = await orchestrator.health_check_services()
+    logger.info(f"Service health status: {health_status}")
+    
+    yield
+    
+    await orchestrator.close()
+    logger.info("AI Agent Service shutting down...")
+
+app = FastAPI(title="AI Agent Service", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+def configure_tracing(app: FastAPI) -> bool:
+    """Export spans over OTLP when OpenTelemetry is installed and OTEL_EXPORTER_OTLP_ENDPOINT is set"""
+    if not OTEL_AVAILABLE or not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": "ai-agent"}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    FastAPIInstrumentor.instrument_app(app)
+    HTTPXClientInstrumentor().instrument()
+    return True
+
+TRACING_ENABLED = configure_tracing(app)
+tracer = trace.get_tracer(__name__) if TRACING_ENABLED else None
+
+def _span(name: str, attributes: Dict[str, Any]):
+    """A span made current for the with-block, or a no-op context when tracing is off"""
+    if not TRACING_ENABLED:
+        return nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+async def _trace_http(event_name: str, info: Dict[str, Any]):
+    """httpcore trace hook: mark the connect, TLS, send and first-byte phases on the current span"""
+    if event_name.endswith((".started", ".complete")):
+        trace.get_current_span().add_event(event_name)
 
 class WorkflowStatus(str, Enum):
     PENDING = "pending"
@@ -46,9 +116,6 @@ class WorkflowStep(BaseModel):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
 
-# In-memory storage for workflows (in production, use Redis or database)
-workflows: Dict[str, Dict[str, Any]] = {}
-
 # Service endpoints configuration
 SERVICES = {
     "pdf": "http://pdf-service:8001",
@@ -57,279 +124,618 @@ SERVICES = {
     "spice": "http://spice-service:8004"
 }
 
+# Shared client settings: fail fast on connect/pool waits, allow long service work,
+# and keep enough idle connections around for the fan-out to all four services
+HTTP_TIMEOUT = httpx.Timeout(connect=3.0, read=30.0, write=10.0, pool=5.0)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=256, keepalive_expiry=30.0)
+
+# Co-located services can be dialed over a Unix domain socket instead of TCP,
+# e.g. PDF_SERVICE_SOCKET=/var/run/espice/pdf.sock (the URL still supplies host and path)
+SERVICE_SOCKETS = {
+    service_name: os.environ[f"{service_name.upper()}_SERVICE_SOCKET"]
+    for service_name in SERVICES
+    if os.getenv(f"{service_name.upper()}_SERVICE_SOCKET")
+}
+
+# Workflow status changes are published on "wf:<workflow_id>" (see MCPTools.wait_for_workflow_completion)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# Workflow records expire a day after their last update; only the most recent
+# finished workflows are kept in the listing
+WORKFLOW_TTL = 86400
+FINISHED_HISTORY = 1000
+RUNNING_SET = "workflows:running"
+FINISHED_LIST = "workflows:finished"
+
+# Workflows run on Celery workers consuming this queue:
+#   celery -A main.celery_app worker -Q workflows --pool threads --concurrency 32
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
+WORKFLOW_QUEUE = "workflows"
+
+# Retries for transient downstream failures (timeouts, connection errors, these statuses)
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# A service's breaker opens after this many consecutive failures and lets a
+# single probe request through once the recovery timeout has passed
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RECOVERY_TIMEOUT = 20.0
+
+# Bulkheads: at most this many concurrent calls per service from one worker
+# process, shared by all the workflows it runs; callers wait up to the queue
+# timeout for a slot and are rejected after that. The bound across the fleet
+# is this times the number of worker processes.
+BULKHEAD_LIMIT = int(os.getenv("BULKHEAD_LIMIT", "32"))
+BULKHEAD_QUEUE_TIMEOUT = 5.0
+
+# Request bodies above the threshold are gzip-encoded for the services listed in
+# GZIP_REQUEST_SERVICES (comma-separated); a service must decode Content-Encoding
+# on requests before it can be listed
+GZIP_REQUEST_SERVICES = {name.strip() for name in os.getenv("GZIP_REQUEST_SERVICES", "").split(",") if name.strip()}
+GZIP_MIN_BYTES = 4096
+GZIP_LEVEL = 5
+
+# Idempotent GETs send a backup request once the first has taken longer than the
+# service's recent p95 latency (HEDGE_DELAY until enough samples are collected)
+HEDGE_DELAY = 0.2
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 100
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one downstream service"""
+    
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 recovery_timeout: float = BREAKER_RECOVERY_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+    
+    def allow_request(self) -> bool:
+        if self.state == BreakerState.CLOSED:
+            return True
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            # Let one probe through; everything else waits for its outcome or the next timeout
+            self.state = BreakerState.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return True
+        return False
+    
+    def record_success(self):
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
+
+class WorkflowStore:
+    """Workflow records in Redis.
+    
+    wf:<id> is a hash with the workflow fields (results and request as JSON),
+    wf:<id>:steps a list of JSON-serialized steps. Unfinished workflow ids are
+    kept in the workflows:running set, finished ones in the workflows:finished
+    list, newest first. An uploaded PDF is staged under wf:<id>:pdf until the
+    workflow finishes, so it never travels through the task queue.
+    """
+    
+    def __init__(self, redis_client):
+        self.redis = redis_client
+    
+    async def create(self, workflow: Dict[str, Any], pdf_file: Optional[str] = None):
+        workflow_id = workflow["workflow_id"]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if pdf_file is not None:
+                pipe.set(f"wf:{workflow_id}:pdf", pdf_file, ex=WORKFLOW_TTL)
+            pipe.hset(f"wf:{workflow_id}", mapping={
+                "workflow_id": workflow_id,
+                "workflow_type": workflow["request"].get("workflow_type", ""),
+                "request": orjson.dumps(workflow["request"]),
+                "created_at": workflow["created_at"].isoformat(),
+                **self._state_fields(workflow)
+            })
+            pipe.expire(f"wf:{workflow_id}", WORKFLOW_TTL)
+            pipe.sadd(RUNNING_SET, workflow_id)
+            await pipe.execute()
+    
+    async def save(self, workflow: Dict[str, Any]):
+        """Write the fields that change while a workflow runs, and its steps"""
+        workflow_id = workflow["workflow_id"]
+        steps_key = f"wf:{workflow_id}:steps"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(f"wf:{workflow_id}", mapping=self._state_fields(workflow))
+            pipe.delete(steps_key)
+            if workflow["steps"]:
+                pipe.rpush(steps_key, *(self._step_json(step) for step in workflow["steps"]))
+            pipe.expire(f"wf:{workflow_id}", WORKFLOW_TTL)
+            pipe.expire(steps_key, WORKFLOW_TTL)
+            if workflow["status"] in (WorkflowStatus.COMPLETED, WorkflowStatus.FAILED):
+                pipe.srem(RUNNING_SET, workflow_id)
+                pipe.delete(f"wf:{workflow_id}:pdf")
+                pipe.lrem(FINISHED_LIST, 0, workflow_id)
+                pipe.lpush(FINISHED_LIST, workflow_id)
+                pipe.ltrim(FINISHED_LIST, 0, FINISHED_HISTORY - 1)
+            await pipe.execute()
+    
+    async def load(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(f"wf:{workflow_id}")
+            pipe.lrange(f"wf:{workflow_id}:steps", 0, -1)
+            fields, steps = await pipe.execute()
+        if not fields:
+            return None
+        return {
+            "workflow_id": workflow_id,
+            "status": WorkflowStatus(fields["status"]),
+            "message": fields["message"],
+            "results": orjson.loads(fields["results"]),
+            "created_at": datetime.fromisoformat(fields["created_at"]),
+            "updated_at": datetime.fromisoformat(fields["updated_at"]),
+            "steps": [WorkflowStep.model_validate_json(step) for step in steps],
+            "request": orjson.loads(fields["request"])
+        }
+    
+    async def load_pdf(self, workflow_id: str) -> Optional[str]:
+        """The base64 PDF staged for a workflow, if any"""
+        return await self.redis.get(f"wf:{workflow_id}:pdf")
+    
+    async def list_recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Summaries of all running workflows and the most recently finished ones"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.smembers(RUNNING_SET)
+            pipe.lrange(FINISHED_LIST, 0, limit - 1)
+            running, finished = await pipe.execute()
+        workflow_ids = list(running) + finished
+        fields = ("status", "workflow_type", "created_at", "updated_at")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for workflow_id in workflow_ids:
+                pipe.hmget(f"wf:{workflow_id}", fields)
+            rows = await pipe.execute()
+        return [
+            {"workflow_id": workflow_id, **dict(zip(fields, row))}
+            for workflow_id, row in zip(workflow_ids, rows)
+            if row[0] is not None  # expired
+        ]
+    
+    async def delete(self, workflow_id: str) -> bool:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(f"wf:{workflow_id}", f"wf:{workflow_id}:steps", f"wf:{workflow_id}:pdf")
+            pipe.srem(RUNNING_SET, workflow_id)
+            pipe.lrem(FINISHED_LIST, 0, workflow_id)
+            deleted, _, _ = await pipe.execute()
+        return deleted > 0
+    
+    @staticmethod
+    def _step_json(step: WorkflowStep) -> str:
+        # An inline base64 PDF is only needed for the service call itself;
+        # keep it out of the record that is rewritten on every save
+        if "pdf_file" in step.input_data:
+            step = step.model_copy(update={
+                "input_data": {k: v for k, v in step.input_data.items() if k != "pdf_file"}
+            })
+        return step.model_dump_json()
+    
+    @staticmethod
+    def _state_fields(workflow: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "status": WorkflowStatus(workflow["status"]).value,
+            "message": workflow["message"],
+            "results": orjson.dumps(workflow["results"]),
+            "updated_at": workflow["updated_at"].isoformat()
+        }
+
+class StepSpec(NamedTuple):
+    """One node of a workflow: what to call, which steps must finish first,
+    and whether the workflow fails with it (required holds the error prefix)"""
+    name: str
+    service: str
+    endpoint: str
+    build_input: Callable[[Dict[str, Any]], Dict[str, Any]]
+    depends_on: Tuple[str, ...] = ()
+    guard: Optional[Callable[[Dict[str, Any]], Any]] = None
+    required: Optional[str] = None
+
+class WorkflowSpec(NamedTuple):
+    steps: Tuple[StepSpec, ...]
+    build_results: Callable[[Dict[str, Any]], Dict[str, Any]]
+    message: str
+
+@lru_cache(maxsize=None)
+def _step_levels(steps: Tuple[StepSpec, ...]) -> Tuple[Tuple[StepSpec, ...], ...]:
+    """Group steps into levels whose dependencies all lie in earlier levels"""
+    levels, done, remaining = [], set(), list(steps)
+    while remaining:
+        level = tuple(step for step in remaining if done.issuperset(step.depends_on))
+        if not level:
+            raise ValueError(f"Unsatisfiable step dependencies: {[step.name for step in remaining]}")
+        levels.append(level)
+        done.update(step.name for step in level)
+        remaining = [step for step in remaining if step not in level]
+    return tuple(levels)
+
+def _pdf_input(context: Dict[str, Any]) -> Dict[str, Any]:
+    return {"pdf_url": context["request"].pdf_url, "pdf_file": context["request"].pdf_file}
+
+def _full_extraction_results(context: Dict[str, Any]) -> Dict[str, Any]:
+    results = dict(context["pdf"])
+    for name, key in (("image", "processed_images"), ("table", "processed_tables"), ("spice", "spice_model")):
+        if name in context:
+            results[key] = context[name]
+    return results
+
+WORKFLOWS: Dict[str, WorkflowSpec] = {
+    "full_extraction": WorkflowSpec(
+        steps=(
+            StepSpec("pdf", "pdf", "/extract-all", _pdf_input, required="PDF processing failed"),
+            StepSpec("image", "image", "/process-images",
+                     lambda ctx: {"images": ctx["pdf"]["images"], "extraction_type": "curves_and_graphs"},
+                     depends_on=("pdf",), guard=lambda ctx: ctx["pdf"].get("images")),
+            StepSpec("table", "table", "/extract-tables",
+                     lambda ctx: {"tables": ctx["pdf"]["tables"], "extraction_type": "parameters_and_data"},
+                     depends_on=("pdf",), guard=lambda ctx: ctx["pdf"].get("tables")),
+            StepSpec("spice", "spice", "/generate-model",
+                     lambda ctx: {
+                         "extracted_data": {
+                             "tables": ctx.get("table", {}),
+                             "images": ctx.get("image", {}),
+                             "text": ctx["pdf"].get("text", "")
+                         },
+                         "model_type": "auto_detect"
+                     },
+                     depends_on=("image", "table"), guard=lambda ctx: ctx.get("table") or ctx.get("image"))
+        ),
+        build_results=_full_extraction_results,
+        message="Full extraction workflow completed successfully"
+    ),
+    "table_only": WorkflowSpec(
+        steps=(
+            StepSpec("pdf", "pdf", "/extract-tables", _pdf_input, required="PDF table extraction failed"),
+            StepSpec("table", "table", "/extract-tables",
+                     lambda ctx: {"tables": ctx["pdf"].get("tables", []), "extraction_type": "parameters_and_data"},
+                     depends_on=("pdf",), required="Table processing failed")
+        ),
+        build_results=lambda ctx: ctx["table"],
+        message="Table extraction workflow completed successfully"
+    ),
+    "image_only": WorkflowSpec(
+        steps=(
+            StepSpec("pdf", "pdf", "/extract-images", _pdf_input, required="PDF image extraction failed"),
+            StepSpec("image", "image", "/process-images",
+                     lambda ctx: {"images": ctx["pdf"].get("images", []), "extraction_type": "curves_and_graphs"},
+                     depends_on=("pdf",), required="Image processing failed")
+        ),
+        build_results=lambda ctx: ctx["image"],
+        message="Image extraction workflow completed successfully"
+    )
+}
+
 class AIAgentOrchestrator:
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # Created in start() so the pool is bound to the server's running event loop
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.socket_clients: Dict[str, httpx.AsyncClient] = {}
+        self.redis_client = None
+        self.store: Optional[WorkflowStore] = None
+        self.breakers = {service_name: CircuitBreaker() for service_name in SERVICES}
+        self.bulkheads = {service_name: asyncio.Semaphore(BULKHEAD_LIMIT) for service_name in SERVICES}
+        self.latencies = {service_name: deque(maxlen=LATENCY_WINDOW) for service_name in SERVICES}
+    
+    async def start(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client used for all downstream calls"""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                limits=HTTP_LIMITS,
+                http2=HTTP2_AVAILABLE
+            )
+            self.socket_clients = {
+                service_name: httpx.AsyncClient(
+                    timeout=HTTP_TIMEOUT,
+                    transport=httpx.AsyncHTTPTransport(uds=socket_path, limits=HTTP_LIMITS)
+                )
+                for service_name, socket_path in SERVICE_SOCKETS.items()
+            }
+        if self.redis_client is None:
+            self.redis_client = redis.from_url(REDIS_URL, socket_connect_timeout=2.0, decode_responses=True)
+            self.store = WorkflowStore(self.redis_client)
+        return self.http_client
+    
+    async def close(self):
+        """Close the HTTP clients and their pooled connections"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        for client in self.socket_clients.values():
+            await client.aclose()
+        self.socket_clients = {}
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+            self.redis_client = None
+    
+    async def publish_status(self, workflow: Dict[str, Any]):
+        """Save a workflow's status change and notify subscribers (the notification is best effort)"""
+        workflow_id = workflow["workflow_id"]
+        await self.store.save(workflow)
+        try:
+            await self.redis_client.publish(
+                f"wf:{workflow_id}",
+                orjson.dumps({"workflow_id": workflow_id, "status": workflow["status"].value})
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish status for workflow {workflow_id}: {e}")
     
     async def health_check_services(self) -> Dict[str, bool]:
         """Check health of all microservices"""
-        health_status = {}
-        for service_name, service_url in SERVICES.items():
+        async def check(service_name: str, service_url: str) -> bool:
             try:
-                response = await self.http_client.get(f"{service_url}/health")
-                health_status[service_name] = response.status_code == 200
+                response = await self._hedged_get(service_name, f"{service_url}/health")
+                return response.status_code == 200
             except Exception as e:
                 logger.error(f"Health check failed for {service_name}: {e}")
-                health_status[service_name] = False
-        return health_status
+                return False
+        
+        # Probe all services at once so the check costs one round trip, not one per service
+        results = await asyncio.gather(*(check(name, url) for name, url in SERVICES.items()))
+        return dict(zip(SERVICES, results))
+    
+    def _client(self, service_name: str) -> httpx.AsyncClient:
+        return self.socket_clients.get(service_name, self.http_client)
+    
+    def _hedge_delay(self, service_name: str) -> float:
+        samples = self.latencies[service_name]
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DELAY
+        return sorted(samples)[int(0.95 * (len(samples) - 1))]
+    
+    async def _hedged_get(self, service_name: str, url: str) -> httpx.Response:
+        """GET with a second request fired if the first is slow; the first success wins.
+        Only for idempotent requests."""
+        start = time.monotonic()
+        pending = {asyncio.create_task(self._client(service_name).get(url))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_delay(service_name))
+            if not done:
+                pending.add(asyncio.create_task(self._client(service_name).get(url)))
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies[service_name].append(time.monotonic() - start)
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _run_step(self, workflow: Dict[str, Any], step: WorkflowStep) -> WorkflowStep:
+        """Record a step on the workflow and execute it, saving the workflow before and after"""
+        workflow["steps"].append(step)
+        await self.store.save(workflow)
+        step = await self.execute_workflow_step(step)
+        await self.store.save(workflow)
+        return step
     
     async def execute_workflow_step(self, step: WorkflowStep) -> WorkflowStep:
         """Execute a single workflow step"""
         step.start_time = datetime.now()
         step.status = WorkflowStatus.RUNNING
         
-        try:
-            service_url = SERVICES.get(step.service)
-            if not service_url:
-                raise Exception(f"Unknown service: {step.service}")
-            
-            # Make request to the service
-            response = await self.http_client.post(
-                f"{service_url}{step.endpoint}",
-                json=step.input_data,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                step.output_data = response.json()
-                step.status = WorkflowStatus.COMPLETED
-            else:
-                step.status = WorkflowStatus.FAILED
-                step.error = f"Service returned {response.status_code}: {response.text}"
+        span_attributes = {"workflow.step_id": step.step_id, "peer.service": step.service, "http.route": step.endpoint}
+        with _span(f"step.{step.service}{step.endpoint}", span_attributes) as span:
+            try:
+                service_url = SERVICES.get(step.service)
+                if not service_url:
+                    raise Exception(f"Unknown service: {step.service}")
                 
-        except Exception as e:
-            step.status = WorkflowStatus.FAILED
-            step.error = str(e)
-            logger.error(f"Step {step.step_id} failed: {e}")
+                # Make request to the service
+                response = await self._post_with_retry(step.service, f"{service_url}{step.endpoint}", step.input_data)
+                
+                if response.status_code == 200:
+                    step.output_data = orjson.loads(response.content)
+                    step.status = WorkflowStatus.COMPLETED
+                else:
+                    step.status = WorkflowStatus.FAILED
+                    step.error = f"Service returned {response.status_code}: {response.text}"
+                    
+            except Exception as e:
+                step.status = WorkflowStatus.FAILED
+                step.error = str(e)
+                logger.error(f"Step {step.step_id} failed: {e}")
+            
+            if span is not None:
+                span.set_attribute("workflow.step.status", step.status.value)
+                if step.error:
+                    span.set_status(trace.Status(trace.StatusCode.ERROR, step.error))
         
         step.end_time = datetime.now()
         return step
     
-    async def execute_full_extraction_workflow(self, workflow_id: str, request: WorkflowRequest):
-        """Execute the full document extraction workflow"""
-        workflow = workflows[workflow_id]
-        workflow["status"] = WorkflowStatus.RUNNING
-        workflow["updated_at"] = datetime.now()
-        
-        try:
-            # Step 1: PDF Processing
-            pdf_step = WorkflowStep(
-                step_id=f"{workflow_id}_pdf_1",
-                service="pdf",
-                endpoint="/extract-all",
-                status=WorkflowStatus.PENDING,
-                input_data={
-                    "pdf_url": request.pdf_url,
-                    "pdf_file": request.pdf_file
-                }
-            )
-            
-            workflow["steps"].append(pdf_step)
-            pdf_step = await self.execute_workflow_step(pdf_step)
-            
-            if pdf_step.status != WorkflowStatus.COMPLETED:
-                raise Exception(f"PDF processing failed: {pdf_step.error}")
-            
-            pdf_data = pdf_step.output_data
-            
-            # Step 2: Image Processing (if images found)
-            if pdf_data.get("images"):
-                image_step = WorkflowStep(
-                    step_id=f"{workflow_id}_image_1",
-                    service="image",
-                    endpoint="/process-images",
-                    status=WorkflowStatus.PENDING,
-                    input_data={
-                        "images": pdf_data["images"],
-                        "extraction_type": "curves_and_graphs"
-                    }
-                )
-                
-                workflow["steps"].append(image_step)
-                image_step = await self.execute_workflow_step(image_step)
-                
-                if image_step.status == WorkflowStatus.COMPLETED:
-                    pdf_data["processed_images"] = image_step.output_data
-            
-            # Step 3: Table Processing (if tables found)
-            if pdf_data.get("tables"):
-                table_step = WorkflowStep(
-                    step_id=f"{workflow_id}_table_1",
-                    service="table",
-                    endpoint="/extract-tables",
-                    status=WorkflowStatus.PENDING,
-                    input_data={
-                        "tables": pdf_data["tables"],
-                        "extraction_type": "parameters_and_data"
-                    }
-                )
-                
-                workflow["steps"].append(table_step)
-                table_step = await self.execute_workflow_step(table_step)
-                
-                if table_step.status == WorkflowStatus.COMPLETED:
-                    pdf_data["processed_tables"] = table_step.output_data
-            
-            # Step 4: SPICE Model Generation (if we have extracted data)
-            if pdf_data.get("processed_tables") or pdf_data.get("processed_images"):
-                spice_step = WorkflowStep(
-                    step_id=f"{workflow_id}_spice_1",
-                    service="spice",
-                    endpoint="/generate-model",
-                    status=WorkflowStatus.PENDING,
-                    input_data={
-                        "extracted_data": {
-                            "tables": pdf_data.get("processed_tables", {}),
-                            "images": pdf_data.get("processed_images", {}),
-                            "text": pdf_data.get("text", "")
-                        },
-                        "model_type": "auto_detect"
-                    }
-                )
-                
-                workflow["steps"].append(spice_step)
-                spice_step = await self.execute_workflow_step(spice_step)
+    async def _post_with_retry(self, service_name: str, url: str, payload: Dict[str, Any]) -> httpx.Response:
+        """POST to a service behind its circuit breaker, retrying transient failures with backoff"""
+        breaker = self.breakers[service_name]
+        body, headers = self._encode_body(service_name, payload)
+        for attempt in range(MAX_ATTEMPTS):
+            if attempt:
+                # Full jitter: a random fraction of the capped exponential delay
+                await asyncio.sleep(random.random() * min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            async with self._bulkhead_slot(service_name):
+                if not breaker.allow_request():
+                    raise Exception(f"Circuit breaker open for service {service_name}")
                 
-                if spice_step.status == WorkflowStatus.COMPLETED:
-                    pdf_data["spice_model"] = spice_step.output_data
-            
-            # Workflow completed successfully
-            workflow["status"] = WorkflowStatus.COMPLETED
-            workflow["results"] = pdf_data
-            workflow["message"] = "Full extraction workflow completed successfully"
+                try:
+                    response = await self._client(service_name).post(
+                        url,
+                        content=body,
+                        headers=headers,
+                        extensions={"trace": _trace_http} if TRACING_ENABLED else None
+                    )
+                except httpx.TransportError as e:
+                    breaker.record_failure()
+                    if attempt == MAX_ATTEMPTS - 1:
+                        raise
+                    logger.warning(f"{service_name} request failed (attempt {attempt + 1}/{MAX_ATTEMPTS}): {e}")
+                    continue
             
-        except Exception as e:
-            workflow["status"] = WorkflowStatus.FAILED
-            workflow["message"] = f"Workflow failed: {str(e)}"
-            logger.error(f"Workflow {workflow_id} failed: {e}")
-        
-        workflow["updated_at"] = datetime.now()
+            # Other 4xx responses are the caller's fault: not retried, not held against the service
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if attempt < MAX_ATTEMPTS - 1:
+                logger.warning(f"{service_name} returned {response.status_code} (attempt {attempt + 1}/{MAX_ATTEMPTS})")
+        return response
     
-    async def execute_table_only_workflow(self, workflow_id: str, request: WorkflowRequest):
-        """Execute table-only extraction workflow"""
-        workflow = workflows[workflow_id]
-        workflow["status"] = WorkflowStatus.RUNNING
-        workflow["updated_at"] = datetime.now()
-        
+    @staticmethod
+    def _encode_body(service_name: str, payload: Dict[str, Any]):
+        """JSON request body and headers, compressed when the service accepts it and it pays off"""
+        body = orjson.dumps(payload)
+        headers = {"Content-Type": "application/json"}
+        if service_name in GZIP_REQUEST_SERVICES and len(body) > GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+    
+    @asynccontextmanager
+    async def _bulkhead_slot(self, service_name: str):
+        """Hold one of the service's concurrent-call slots"""
+        bulkhead = self.bulkheads[service_name]
         try:
-            # Step 1: PDF Processing (tables only)
-            pdf_step = WorkflowStep(
-                step_id=f"{workflow_id}_pdf_1",
-                service="pdf",
-                endpoint="/extract-tables",
-                status=WorkflowStatus.PENDING,
-                input_data={
-                    "pdf_url": request.pdf_url,
-                    "pdf_file": request.pdf_file
-                }
-            )
-            
-            workflow["steps"].append(pdf_step)
-            pdf_step = await self.execute_workflow_step(pdf_step)
-            
-            if pdf_step.status != WorkflowStatus.COMPLETED:
-                raise Exception(f"PDF table extraction failed: {pdf_step.error}")
-            
-            # Step 2: Table Processing
-            table_step = WorkflowStep(
-                step_id=f"{workflow_id}_table_1",
-                service="table",
-                endpoint="/extract-tables",
-                status=WorkflowStatus.PENDING,
-                input_data={
-                    "tables": pdf_step.output_data.get("tables", []),
-                    "extraction_type": "parameters_and_data"
-                }
-            )
-            
-            workflow["steps"].append(table_step)
-            table_step = await self.execute_workflow_step(table_step)
-            
-            if table_step.status == WorkflowStatus.COMPLETED:
-                workflow["status"] = WorkflowStatus.COMPLETED
-                workflow["results"] = table_step.output_data
-                workflow["message"] = "Table extraction workflow completed successfully"
-            else:
-                raise Exception(f"Table processing failed: {table_step.error}")
-                
-        except Exception as e:
-            workflow["status"] = WorkflowStatus.FAILED
-            workflow["message"] = f"Workflow failed: {str(e)}"
-            logger.error(f"Workflow {workflow_id} failed: {e}")
-        
-        workflow["updated_at"] = datetime.now()
+            await asyncio.wait_for(bulkhead.acquire(), BULKHEAD_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Saturation on our side says nothing about the service, so the breaker is not involved
+            raise Exception(f"bulkhead_rejected: {service_name} already has {BULKHEAD_LIMIT} calls in flight")
+        try:
+            yield
+        finally:
+            bulkhead.release()
     
-    async def execute_image_only_workflow(self, workflow_id: str, request: WorkflowRequest):
-        """Execute image-only extraction workflow"""
-        workflow = workflows[workflow_id]
+    async def execute_workflow(self, workflow_type: str, workflow_id: str, request: WorkflowRequest):
+        """Run a workflow's steps level by level, independent steps concurrently"""
+        # Step spans (and the HTTP client spans under them) are children of this one
+        with _span(f"workflow.{workflow_type}", {"workflow.id": workflow_id, "workflow.type": workflow_type}):
+            await self._execute_workflow(workflow_type, workflow_id, request)
+    
+    async def _execute_workflow(self, workflow_type: str, workflow_id: str, request: WorkflowRequest):
+        spec = WORKFLOWS[workflow_type]
+        workflow = await self.store.load(workflow_id)
+        if workflow is None:
+            logger.warning(f"Workflow {workflow_id} was deleted before it started")
+            return
+        # Tasks are acknowledged late, so a redelivered one may find the workflow
+        # already finished, or half run by a worker that died
+        if workflow["status"] in (WorkflowStatus.COMPLETED, WorkflowStatus.FAILED):
+            logger.info(f"Workflow {workflow_id} already {workflow['status'].value}; skipping redelivered task")
+            return
+        workflow["steps"] = []
+        if request.pdf_file is None:
+            request = request.model_copy(update={"pdf_file": await self.store.load_pdf(workflow_id)})
         workflow["status"] = WorkflowStatus.RUNNING
         workflow["updated_at"] = datetime.now()
+        await self.publish_status(workflow)
         
+        # Outputs of completed steps by step name, plus the original request
+        context: Dict[str, Any] = {"request": request}
         try:
-            # Step 1: PDF Processing (images only)
-            pdf_step = WorkflowStep(
-                step_id=f"{workflow_id}_pdf_1",
-                service="pdf",
-                endpoint="/extract-images",
-                status=WorkflowStatus.PENDING,
-                input_data={
-                    "pdf_url": request.pdf_url,
-                    "pdf_file": request.pdf_file
-                }
-            )
-            
-            workflow["steps"].append(pdf_step)
-            pdf_step = await self.execute_workflow_step(pdf_step)
-            
-            if pdf_step.status != WorkflowStatus.COMPLETED:
-                raise Exception(f"PDF image extraction failed: {pdf_step.error}")
-            
-            # Step 2: Image Processing
-            image_step = WorkflowStep(
-                step_id=f"{workflow_id}_image_1",
-                service="image",
-                endpoint="/process-images",
-                status=WorkflowStatus.PENDING,
-                input_data={
-                    "images": pdf_step.output_data.get("images", []),
-                    "extraction_type": "curves_and_graphs"
-                }
-            )
+            for level in _step_levels(spec.steps):
+                specs = [step_spec for step_spec in level if step_spec.guard is None or step_spec.guard(context)]
+                steps = [
+                    WorkflowStep(
+                        step_id=f"{workflow_id}_{step_spec.name}_1",
+                        service=step_spec.service,
+                        endpoint=step_spec.endpoint,
+                        status=WorkflowStatus.PENDING,
+                        input_data=step_spec.build_input(context)
+                    )
+                    for step_spec in specs
+                ]
+                results = await asyncio.gather(
+                    *(self._run_step(workflow, step) for step in steps),
+                    return_exceptions=True
+                )
+                for step_spec, step, result in zip(specs, steps, results):
+                    if isinstance(result, Exception):
+                        step.status = WorkflowStatus.FAILED
+                        step.error = str(result)
+                        logger.error(f"Step {step.step_id} failed: {result}")
+                    if step.status == WorkflowStatus.COMPLETED:
+                        context[step_spec.name] = step.output_data
+                    elif step_spec.required:
+                        raise Exception(f"{step_spec.required}: {step.error}")
             
-            workflow["steps"].append(image_step)
-            image_step = await self.execute_workflow_step(image_step)
+            workflow["status"] = WorkflowStatus.COMPLETED
+            workflow["results"] = spec.build_results(context)
+            workflow["message"] = spec.message
             
-            if image_step.status == WorkflowStatus.COMPLETED:
-                workflow["status"] = WorkflowStatus.COMPLETED
-                workflow["results"] = image_step.output_data
-                workflow["message"] = "Image extraction workflow completed successfully"
-            else:
-                raise Exception(f"Image processing failed: {image_step.error}")
-                
         except Exception as e:
             workflow["status"] = WorkflowStatus.FAILED
             workflow["message"] = f"Workflow failed: {str(e)}"
             logger.error(f"Workflow {workflow_id} failed: {e}")
         
         workflow["updated_at"] = datetime.now()
+        await self.publish_status(workflow)
 
 # Initialize orchestrator
 orchestrator = AIAgentOrchestrator()
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the AI agent service"""
-    logger.info("AI Agent Service starting up...")
-    
-    # Health check all services
-    health_status = await orchestrator.health_check_services()
-    logger.info(f"Service health status: {health_status}")
+celery_app = Celery("ai_agent", broker=CELERY_BROKER_URL)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    await orchestrator.http_client.aclose()
-    logger.info("AI Agent Service shutting down...")
+# Worker processes don't run the app lifespan. Each one starts an orchestrator
+# on an event loop of its own the first time it is needed and keeps both for its
+# lifetime, so breakers, bulkheads, latency windows and pooled connections are
+# shared by every task the process runs.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_orchestrator: Optional[AIAgentOrchestrator] = None
+_worker_lock = threading.Lock()
+
+def _worker_runtime() -> Tuple[asyncio.AbstractEventLoop, AIAgentOrchestrator]:
+    """This process's workflow event loop and the orchestrator running on it"""
+    global _worker_loop, _worker_orchestrator
+    with _worker_lock:
+        if _worker_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="workflow-loop", daemon=True).start()
+            worker = AIAgentOrchestrator()
+            asyncio.run_coroutine_threadsafe(worker.start(), loop).result()
+            _worker_loop, _worker_orchestrator = loop, worker
+        return _worker_loop, _worker_orchestrator
+
+@worker_process_init.connect
+def _start_worker_runtime(**kwargs):
+    _worker_runtime()
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    global _worker_loop, _worker_orchestrator
+    with _worker_lock:
+        if _worker_loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_worker_orchestrator.close(), _worker_loop).result(timeout=10)
+        finally:
+            _worker_loop.call_soon_threadsafe(_worker_loop.stop)
+            _worker_loop = _worker_orchestrator = None
+
+@celery_app.task(name="ai_agent.run_workflow", acks_late=True, ignore_result=True)
+def run_workflow(workflow_type: str, workflow_id: str, request_data: Dict[str, Any]):
+    """Execute a workflow on a queue worker; its state is shared through the workflow store"""
+    request = WorkflowRequest(**request_data)
+    loop, worker = _worker_runtime()
+    # Tasks from a threads pool run side by side on the shared loop
+    asyncio.run_coroutine_threadsafe(worker.execute_workflow(workflow_type, workflow_id, request), loop).result()
 
 @app.get("/health")
 async def health_check():
@@ -337,13 +743,16 @@ async def health_check():
     return {"status": "healthy", "service": "ai-agent"}
 
 @app.post("/workflow/start", response_model=WorkflowResponse)
-async def start_workflow(request: WorkflowRequest, background_tasks: BackgroundTasks):
+async def start_workflow(request: WorkflowRequest):
     """Start a new workflow"""
+    if request.workflow_type not in WORKFLOWS:
+        raise HTTPException(status_code=400, detail=f"Unknown workflow type: {request.workflow_type}")
+    
     workflow_id = str(uuid.uuid4())
     created_at = datetime.now()
     
     # Initialize workflow
-    workflows[workflow_id] = {
+    workflow = {
         "workflow_id": workflow_id,
         "status": WorkflowStatus.PENDING,
         "message": "Workflow initialized",
@@ -351,30 +760,28 @@ async def start_workflow(request: WorkflowRequest, background_tasks: BackgroundT
         "created_at": created_at,
         "updated_at": created_at,
         "steps": [],
-        "request": request.dict()
+        # The base64 PDF is staged separately and dropped once the workflow finishes
+        "request": request.model_dump(exclude={"pdf_file"})
     }
     
-    # Start workflow execution in background
-    if request.workflow_type == "full_extraction":
-        background_tasks.add_task(
-            orchestrator.execute_full_extraction_workflow, 
-            workflow_id, 
-            request
-        )
-    elif request.workflow_type == "table_only":
-        background_tasks.add_task(
-            orchestrator.execute_table_only_workflow, 
-            workflow_id, 
-            request
-        )
-    elif request.workflow_type == "image_only":
-        background_tasks.add_task(
-            orchestrator.execute_image_only_workflow, 
-            workflow_id, 
-            request
+    # The record must exist before a worker can pick the task up
+    await orchestrator.store.create(workflow, pdf_file=request.pdf_file)
+    
+    # Hand execution to a queue worker; the workflow id doubles as the task id
+    try:
+        await asyncio.to_thread(
+            run_workflow.apply_async,
+            args=(request.workflow_type, workflow_id, workflow["request"]),
+            task_id=workflow_id,
+            queue=WORKFLOW_QUEUE
         )
-    else:
-        raise HTTPException(status_code=400, detail=f"Unknown workflow type: {request.workflow_type}")
+    except Exception as e:
+        logger.error(f"Failed to queue workflow {workflow_id}: {e}")
+        workflow["status"] = WorkflowStatus.FAILED
+        workflow["message"] = f"Workflow could not be queued: {str(e)}"
+        workflow["updated_at"] = datetime.now()
+        await orchestrator.store.save(workflow)
+        raise HTTPException(status_code=503, detail="Workflow queue unavailable")
     
     return WorkflowResponse(
         workflow_id=workflow_id,
@@ -388,46 +795,37 @@ async def start_workflow(request: WorkflowRequest, background_tasks: BackgroundT
 @app.get("/workflow/{workflow_id}", response_model=WorkflowResponse)
 async def get_workflow_status(workflow_id: str):
     """Get workflow status and results"""
-    if workflow_id not in workflows:
+    workflow = await orchestrator.store.load(workflow_id)
+    if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    workflow = workflows[workflow_id]
     return WorkflowResponse(**workflow)
 
 @app.get("/workflow/{workflow_id}/steps")
 async def get_workflow_steps(workflow_id: str):
     """Get detailed workflow steps"""
-    if workflow_id not in workflows:
+    workflow = await orchestrator.store.load(workflow_id)
+    if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
     return {
         "workflow_id": workflow_id,
-        "steps": workflows[workflow_id]["steps"]
+        "steps": workflow["steps"]
     }
 
 @app.get("/workflows")
 async def list_workflows():
-    """List all workflows"""
+    """List running workflows and the most recently finished ones"""
     return {
-        "workflows": [
-            {
-                "workflow_id": wf["workflow_id"],
-                "status": wf["status"],
-                "workflow_type": wf["request"].get("workflow_type"),
-                "created_at": wf["created_at"],
-                "updated_at": wf["updated_at"]
-            }
-            for wf in workflows.values()
-        ]
+        "workflows": await orchestrator.store.list_recent()
     }
 
 @app.delete("/workflow/{workflow_id}")
 async def delete_workflow(workflow_id: str):
     """Delete a workflow"""
-    if workflow_id not in workflows:
+    if not await orchestrator.store.delete(workflow_id):
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    del workflows[workflow_id]
     return {"message": "Workflow deleted successfully"}
 
 @app.get("/services/health")
@@ -5,19 +5,46 @@ Provides tools for AI agents to interact with the microservices architecture
 
 import json
 import asyncio
+import os
 from typing import Dict, Any, List, Optional
 import httpx
+import redis.asyncio as redis
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = ("completed", "failed")
+
 class MCPTools:
     """MCP Tools for AI Agent orchestration"""
     
-    def __init__(self, base_url: str = "http://localhost:8005"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8005",
+        redis_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.base_url = base_url
-        self.http_client = httpx.AsyncClient(timeout=60.0)
+        # A client passed in is shared and stays open; one created here is closed by aclose()
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=60.0)
+        # Without Redis, wait_for_workflow_completion falls back to polling
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        self.redis_client = redis.from_url(redis_url, socket_connect_timeout=2.0) if redis_url else None
+    
+    async def aclose(self):
+        """Release the HTTP and Redis connections held by these tools"""
+        if self._owns_http_client:
+            await self.http_client.aclose()
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+    
+    async def __aenter__(self) -> "MCPTools":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
     
     async def start_document_extraction_workflow(
         self, 
@@ -184,13 +211,21 @@ class MCPTools:
         Args:
             workflow_id: The workflow ID to monitor
             timeout: Maximum time to wait in seconds
-            poll_interval: Time between status checks in seconds
+            poll_interval: Time between status checks in seconds (only without Redis)
         
         Returns:
             Final workflow status and results
         """
         start_time = datetime.now()
         
+        if self.redis_client is not None:
+            try:
+                return await asyncio.wait_for(self._wait_for_status_event(workflow_id), timeout)
+            except asyncio.TimeoutError:
+                raise Exception(f"Workflow {workflow_id} timed out after {timeout} seconds")
+            except redis.RedisError as e:
+                logger.warning(f"Status notifications unavailable, polling workflow {workflow_id}: {e}")
+        
         while True:
             # Check if timeout exceeded
             elapsed = (datetime.now() - start_time).total_seconds()
@@ -200,12 +235,26 @@ class MCPTools:
             # Get current status
             status = await self.get_workflow_status(workflow_id)
             
-            if status["status"] in ["completed", "failed"]:
+            if status["status"] in TERMINAL_STATUSES:
                 return status
             
             # Wait before next check
             await asyncio.sleep(poll_interval)
     
+    async def _wait_for_status_event(self, workflow_id: str) -> Dict[str, Any]:
+        """Block on the workflow's status channel until it reaches a final state"""
+        async with self.redis_client.pubsub() as pubsub:
+            await pubsub.subscribe(f"wf:{workflow_id}")
+            # The workflow may have finished before the subscription was active
+            status = await self.get_workflow_status(workflow_id)
+            if status["status"] in TERMINAL_STATUSES:
+                return status
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                if json.loads(message["data"]).get("status") in TERMINAL_STATUSES:
+                    return await self.get_workflow_status(workflow_id)
+    
     async def execute_full_document_analysis(
         self, 
         pdf_url: Optional[str] = None, 
@@ -369,6 +418,8 @@ async def example_usage():
         
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        await mcp_tools.aclose()
 
 if __name__ == "__main__":
     asyncio.run(example_usage()) 
\ No newline at end of file
@@ -292,6 +292,8 @@ async def example_semiconductor_processing():
         
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        await mcp_tools.aclose()
 
 async def example_batch_processing():
     """Example of batch processing multiple documents"""
@@ -307,6 +309,8 @@ async def example_batch_processing():
         
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        await mcp_tools.aclose()
 
 if __name__ == "__main__":
     # Run example
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
@@ -253,6 +253,23 @@ def extract_metadata_from_pdf(pdf_bytes: bytes, include_statistics: bool = True)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error extracting metadata from PDF: {str(e)}")
 
+def _tables_payload(pdf_bytes: bytes) -> Dict[str, Any]:
+    tables = extract_tables_from_pdf(pdf_bytes)
+    return {"tables": tables, "count": len(tables)}
+
+def _images_payload(pdf_bytes: bytes) -> Dict[str, Any]:
+    images = extract_images_from_pdf(pdf_bytes)
+    return {"images": images, "count": len(images)}
+
+# Operations available to /api/pdf/extract-batch, each producing the same data
+# as its single-operation endpoint with default options
+BATCH_OPERATIONS = {
+    "text": extract_text_from_pdf,
+    "tables": _tables_payload,
+    "images": _images_payload,
+    "metadata": extract_metadata_from_pdf,
+}
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -391,5 +408,38 @@ async def extract_metadata(file: UploadFile = File(...), request: Optional[Metad
             metadata=create_metadata(processing_time)
         )
 
+@app.post("/api/pdf/extract-batch")
+async def extract_batch(
+    file: UploadFile = File(...),
+    operations: List[str] = Query(default=list(BATCH_OPERATIONS))
+):
+    """Run several extractions on one uploaded PDF and return them in a single response"""
+    if not file.filename or not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+    unknown = [op for op in operations if op not in BATCH_OPERATIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown operations: {', '.join(unknown)}")
+    
+    start_time = datetime.now()
+    
+    try:
+        pdf_bytes = await file.read()
+        result = {op: BATCH_OPERATIONS[op](pdf_bytes) for op in dict.fromkeys(operations)}
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        return ServiceResponse(
+            success=True,
+            data=result,
+            metadata=create_metadata(processing_time)
+        )
+    except Exception as e:
+        processing_time = (datetime.now() - start_time).total_seconds()
+        return ServiceResponse(
+            success=False,
+            error=str(e),
+            metadata=create_metadata(processing_time)
+        )
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8002) 
\ No newline at end of file